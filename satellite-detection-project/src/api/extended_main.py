@@ -404,7 +404,7 @@ async def detect_fires(
 
         # Store in history
         if high_conf:
-            fire_history.add_detections_batch(high_conf, radius_km, coordinates)
+            await fire_history.add_detections_batch_async(high_conf, radius_km, coordinates)
 
         # Send email alerts if configured
         if background_tasks and high_conf:
@@ -2,29 +2,251 @@
 Data export functionality for fire detection data
 """
 
-import json
 import csv
 import os
-from typing import List, Dict, Optional, Union
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Union, Tuple, Any, Iterable
 from datetime import datetime
 import logging
 
 from ..config import AppConfig
 
+# Prefer the C/Rust JSON encoders when installed, falling back to stdlib
+try:
+    import orjson as _json
+    JSON_BACKEND = 'orjson'
+except ImportError:
+    try:
+        import ujson as _json
+        JSON_BACKEND = 'ujson'
+    except ImportError:
+        import json as _json
+        JSON_BACKEND = 'stdlib'
+
 logger = logging.getLogger(__name__)
 
+# Number of leading rows probed for field names before switching to the
+# cheap subset check for the remaining rows
+FIELDNAME_SAMPLE_SIZE = 32
+
+# Write buffer for export files; larger buffers mean fewer write() syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Per-detection fields carried into alert reports, in output order
+ALERT_FIELDS = [
+    'latitude', 'longitude', 'confidence', 'power_mw',
+    'distance_km', 'source', 'timestamp'
+]
+
+def _json_default(obj):
+    """Convert NumPy scalars and arrays, which the C encoders reject, to Python values"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson rejects NumPy values and non-str keys that the stdlib encoder accepts
+if JSON_BACKEND == 'orjson':
+    ORJSON_OPTIONS = _json.OPT_SERIALIZE_NUMPY | _json.OPT_NON_STR_KEYS
+
+def _dump(obj, filepath: str, indent: Optional[int] = None):
+    """
+    Write obj as UTF-8 JSON using the fastest available backend
+    
+    Args:
+        obj: JSON-serializable object
+        filepath: Output file path
+        indent: Indentation width, or None for compact output
+    """
+    if JSON_BACKEND == 'orjson':
+        # orjson only supports two-space indentation
+        option = ORJSON_OPTIONS | (_json.OPT_INDENT_2 if indent else 0)
+        with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as jsonfile:
+            jsonfile.write(_json.dumps(obj, default=_json_default, option=option))
+    elif JSON_BACKEND == 'ujson':
+        with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as jsonfile:
+            _json.dump(obj, jsonfile, indent=indent or 0, ensure_ascii=False, default=_json_default)
+    else:
+        with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE, encoding='utf-8') as jsonfile:
+            _json.dump(obj, jsonfile, indent=indent, ensure_ascii=False, default=_json_default)
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes using the active backend"""
+    if JSON_BACKEND == 'orjson':
+        return _json.dumps(obj, default=_json_default, option=ORJSON_OPTIONS)
+    return _json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+def _dump_streamed(obj: Dict, filepath: str, key: str, items: Iterable):
+    """
+    Write obj as compact JSON with items appended as the array under key
+    
+    Items are serialized and written one at a time, so only a single
+    element's JSON text is held in memory however long the array is.
+    
+    Args:
+        obj: JSON-serializable dict written ahead of the array
+        filepath: Output file path
+        key: Name of the array member added as the last key of obj
+        items: Iterable of JSON-serializable array elements
+    """
+    head = _dumps(obj)
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as jsonfile:
+        # Reopen the serialized object by dropping its closing brace
+        jsonfile.write(head[:-1])
+        if obj:
+            jsonfile.write(b',')
+        jsonfile.write(_dumps(key) + b':[')
+        for i, item in enumerate(items):
+            if i:
+                jsonfile.write(b',')
+            jsonfile.write(_dumps(item))
+        jsonfile.write(b']}')
+
+@lru_cache(maxsize=32)
+def _row_flattener(fieldnames: Tuple[str, ...]):
+    """
+    Build a function mapping a row dict to a tuple of its values
+    
+    The field names are inlined as constants into generated source, so each
+    row costs one straight-line run of dict.get calls instead of a loop.
+    
+    Args:
+        fieldnames: Field names in output order
+        
+    Returns:
+        Callable taking a row dict and returning a tuple (None for missing fields)
+    """
+    if not all(isinstance(field, str) for field in fieldnames):
+        return lambda row: tuple(map(row.get, fieldnames))
+    
+    getters = "".join(f"get({field!r}), " for field in fieldnames)
+    source = f"def _flatten(row):\n    get = row.get\n    return ({getters})\n"
+    namespace = {}
+    exec(source, namespace)
+    return namespace['_flatten']
+
 class DataExporter:
     """Handles exporting detection data to various formats"""
     
     def __init__(self):
         self.export_dir = AppConfig.export.export_dir
         os.makedirs(self.export_dir, exist_ok=True)
+        
+        # Resolve the optional Excel dependencies once instead of per call
+        try:
+            import pandas as pd
+            self._pd = pd
+        except ImportError:
+            self._pd = None
+        
+        try:
+            import openpyxl  # noqa: F401
+            self._have_excel = self._pd is not None
+        except ImportError:
+            self._have_excel = False
+    
+    def _resolve_path(
+        self, 
+        prefix: str,
+        ext: str,
+        filename: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> str:
+        """
+        Resolve the output path for an export
+        
+        Args:
+            prefix: Filename prefix used when no filename is given
+            ext: File extension without the dot
+            filename: Explicit output filename (optional)
+            now: Timestamp for the generated filename (defaults to now)
+            
+        Returns:
+            str: Path inside the export directory
+        """
+        if filename is None:
+            filename = f"{prefix}_{(now or datetime.now()):%Y%m%d_%H%M%S}.{ext}"
+        return os.path.join(self.export_dir, filename)
+    
+    def _discover_fieldnames(self, data: List[Dict]) -> List[str]:
+        """
+        Collect field names across all rows, preserving first-seen order
+        
+        Only the first rows are unioned key by key; later rows are merely
+        checked against the known fields and expanded if they carry extras.
+        
+        Args:
+            data: List of detection data dictionaries
+            
+        Returns:
+            List[str]: Field names in insertion order
+        """
+        fields = {}
+        for item in data[:FIELDNAME_SAMPLE_SIZE]:
+            fields.update(dict.fromkeys(item))
+        
+        known = fields.keys()
+        for item in data[FIELDNAME_SAMPLE_SIZE:]:
+            if not known >= item.keys():
+                fields.update(dict.fromkeys(item))
+        
+        return list(fields)
+    
+    def _to_soa(
+        self, 
+        data: List[Dict],
+        fieldnames: Optional[List[str]] = None,
+        default: Any = None
+    ) -> Dict[str, list]:
+        """
+        Convert row dictionaries into one list per field (columnar layout)
+        
+        Args:
+            data: List of detection data dictionaries
+            fieldnames: Fields to extract (discovered from data if omitted)
+            default: Value used where a row lacks a field
+            
+        Returns:
+            Dict[str, list]: Field name -> list of values in row order
+        """
+        if fieldnames is None:
+            fieldnames = self._discover_fieldnames(data)
+        return {
+            field: [item.get(field, default) for item in data]
+            for field in fieldnames
+        }
+    
+    def _prepare(
+        self, 
+        data: List[Dict],
+        with_frame: bool = False
+    ) -> Tuple[List[str], List[tuple], Any]:
+        """
+        Build the tabular form of the data shared by the CSV and Excel writers
+        
+        Args:
+            data: List of detection data dictionaries
+            with_frame: Whether to also build a pandas DataFrame
+            
+        Returns:
+            Tuple: (fieldnames, rows as tuples, DataFrame or None)
+        """
+        fieldnames = self._discover_fieldnames(data)
+        rows = list(map(_row_flattener(tuple(fieldnames)), data))
+        
+        df = None
+        if with_frame and self._pd is not None:
+            df = self._pd.DataFrame.from_records(rows, columns=fieldnames)
+        
+        return fieldnames, rows, df
     
     def export_to_csv(
         self, 
         data: List[Dict], 
         filename: str = None,
-        include_headers: bool = True
+        include_headers: bool = True,
+        prepared: Optional[Tuple[List[str], List[tuple], Any]] = None
     ) -> str:
         """
         Export data to CSV format
@@ -33,6 +255,7 @@ class DataExporter:
             data: List of detection data dictionaries
             filename: Output filename (optional)
             include_headers: Whether to include column headers
+            prepared: Precomputed result of _prepare(data) (optional)
             
         Returns:
             str: Path to exported file
@@ -42,44 +265,37 @@ class DataExporter:
                 logger.warning("No data to export to CSV")
                 return ""
             
-            if filename is None:
-                filename = f"detections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            
-            filepath = os.path.join(self.export_dir, filename)
+            filepath = self._resolve_path("detections", "csv", filename)
             
-            # Get all possible field names
-            fieldnames = set()
-            for item in data:
-                fieldnames.update(item.keys())
-            fieldnames = sorted(list(fieldnames))
+            if prepared is None:
+                prepared = self._prepare(data)
+            fieldnames, rows, _ = prepared
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(
+            with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE, newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(
                     csvfile, 
-                    fieldnames=fieldnames,
                     delimiter=AppConfig.export.csv_delimiter
                 )
                 
                 if include_headers:
-                    writer.writeheader()
+                    writer.writerow(fieldnames)
                 
-                for row in data:
-                    # Ensure all fields are present
-                    row_data = {field: row.get(field, '') for field in fieldnames}
-                    writer.writerow(row_data)
+                # Missing fields are None, which csv writes as an empty cell
+                writer.writerows(rows)
             
-            logger.info(f"Exported {len(data)} records to CSV: {filepath}")
+            logger.info("Exported %d records to CSV: %s", len(data), filepath)
             return filepath
             
         except Exception as e:
-            logger.error(f"Failed to export data to CSV: {e}")
+            logger.error("Failed to export data to CSV: %s", e)
             return ""
     
     def export_to_json(
         self, 
         data: List[Dict], 
         filename: str = None,
-        pretty_print: bool = True
+        pretty_print: bool = True,
+        columnar: bool = False
     ) -> str:
         """
         Export data to JSON format
@@ -88,6 +304,7 @@ class DataExporter:
             data: List of detection data dictionaries
             filename: Output filename (optional)
             pretty_print: Whether to format JSON with indentation
+            columnar: Write an object of per-field arrays instead of a list of rows
             
         Returns:
             str: Path to exported file
@@ -97,76 +314,68 @@ class DataExporter:
                 logger.warning("No data to export to JSON")
                 return ""
             
-            if filename is None:
-                filename = f"detections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            filepath = os.path.join(self.export_dir, filename)
+            filepath = self._resolve_path("detections", "json", filename)
             
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                if pretty_print:
-                    json.dump(
-                        data, 
-                        jsonfile, 
-                        indent=AppConfig.export.json_indent,
-                        ensure_ascii=False
-                    )
-                else:
-                    json.dump(data, jsonfile, ensure_ascii=False)
+            payload = self._to_soa(data) if columnar else data
+            _dump(payload, filepath, AppConfig.export.json_indent if pretty_print else None)
             
-            logger.info(f"Exported {len(data)} records to JSON: {filepath}")
+            logger.info("Exported %d records to JSON: %s", len(data), filepath)
             return filepath
             
         except Exception as e:
-            logger.error(f"Failed to export data to JSON: {e}")
+            logger.error("Failed to export data to JSON: %s", e)
             return ""
     
     def export_to_excel(
         self, 
         data: List[Dict], 
-        filename: str = None
+        filename: str = None,
+        prepared: Optional[Tuple[List[str], List[tuple], Any]] = None
     ) -> str:
         """
-        Export data to Excel format (requires pandas)
+        Export data to Excel format (requires pandas and openpyxl)
         
         Args:
             data: List of detection data dictionaries
             filename: Output filename (optional)
+            prepared: Precomputed result of _prepare(data) (optional)
             
         Returns:
             str: Path to exported file
         """
         try:
-            import pandas as pd
+            if not self._have_excel:
+                logger.warning("Pandas/openpyxl not available, cannot export to Excel")
+                return ""
             
             if not data:
                 logger.warning("No data to export to Excel")
                 return ""
             
-            if filename is None:
-                filename = f"detections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            filepath = self._resolve_path("detections", "xlsx", filename)
             
-            filepath = os.path.join(self.export_dir, filename)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
+            # Convert to DataFrame, reusing a prepared one when available
+            df = prepared[2] if prepared is not None else None
+            if df is None:
+                df = self._pd.DataFrame(data)
             
             # Export to Excel
             df.to_excel(filepath, index=False, engine='openpyxl')
             
-            logger.info(f"Exported {len(data)} records to Excel: {filepath}")
+            logger.info("Exported %d records to Excel: %s", len(data), filepath)
             return filepath
             
-        except ImportError:
-            logger.warning("Pandas not available, cannot export to Excel")
-            return ""
         except Exception as e:
-            logger.error(f"Failed to export data to Excel: {e}")
+            logger.error("Failed to export data to Excel: %s", e)
             return ""
     
     def export_fire_summary(
         self, 
         detections: List[Dict],
-        filename: str = None
+        filename: str = None,
+        include_details: bool = True,
+        pretty_print: bool = False,
+        stream: bool = False
     ) -> str:
         """
         Export a summary report of fire detections
@@ -174,6 +383,12 @@ class DataExporter:
         Args:
             detections: List of fire detection data
             filename: Output filename (optional)
+            include_details: Whether to embed the full detection list
+            pretty_print: Whether to format JSON with indentation
+            stream: Write the details element by element to bound memory
+                (always compact, the details become the last key)
+            columnar: Write the details as an object of per-field arrays
+                instead of one object per detection (not streamed)
             
         Returns:
             str: Path to exported file
@@ -183,31 +398,34 @@ class DataExporter:
                 logger.warning("No fire detections to export summary")
                 return ""
             
-            if filename is None:
-                filename = f"fire_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            # One clock read so the filename and report timestamp agree
+            now = datetime.now()
             
-            filepath = os.path.join(self.export_dir, filename)
+            filepath = self._resolve_path("fire_summary", "json", filename, now=now)
             
-            # Calculate summary statistics
-            total_detections = len(detections)
-            high_confidence = len([d for d in detections if d.get('confidence', 0) >= 0.8])
-            medium_confidence = len([d for d in detections if 0.5 <= d.get('confidence', 0) < 0.8])
-            low_confidence = len([d for d in detections if d.get('confidence', 0) < 0.5])
+            # Calculate summary statistics on columns extracted once
+            columns = self._to_soa(detections, ['confidence', 'power_mw'], default=0)
+            confidences = columns['confidence']
             
-            avg_confidence = sum(d.get('confidence', 0) for d in detections) / total_detections
-            total_power = sum(d.get('power_mw', 0) for d in detections)
+            total_detections = len(detections)
+            high_confidence = 0
+            medium_confidence = 0
+            for confidence in confidences:
+                if confidence >= 0.8:
+                    high_confidence += 1
+                elif confidence >= 0.5:
+                    medium_confidence += 1
+            low_confidence = total_detections - high_confidence - medium_confidence
+            
+            avg_confidence = sum(confidences) / total_detections
+            total_power = sum(columns['power_mw'])
             
             # Group by source
-            sources = {}
-            for detection in detections:
-                source = detection.get('source', 'Unknown')
-                if source not in sources:
-                    sources[source] = 0
-                sources[source] += 1
+            sources = dict(Counter(d.get('source', 'Unknown') for d in detections))
             
             summary = {
                 "report_metadata": {
-                    "export_time": datetime.now().isoformat(),
+                    "export_time": now.isoformat(),
                     "total_detections": total_detections,
                     "report_type": "Fire Detection Summary"
                 },
@@ -228,28 +446,35 @@ class DataExporter:
                 "statistical_summary": {
                     "average_confidence": round(avg_confidence, 2),
                     "total_thermal_power_mw": round(total_power, 2),
-                    "max_confidence": round(max(d.get('confidence', 0) for d in detections), 2),
-                    "min_confidence": round(min(d.get('confidence', 0) for d in detections), 2)
+                    "max_confidence": round(max(confidences), 2),
+                    "min_confidence": round(min(confidences), 2)
                 },
-                "source_breakdown": sources,
-                "detection_details": detections
+                "source_breakdown": sources
             }
             
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                json.dump(summary, jsonfile, indent=AppConfig.export.json_indent, ensure_ascii=False)
+            if include_details and stream and not columnar:
+                _dump_streamed(summary, filepath, "detection_details", detections)
+            else:
+                if include_details:
+                    summary["detection_details"] = detections
+                _dump(summary, filepath, AppConfig.export.json_indent if pretty_print else None)
             
-            logger.info(f"Exported fire summary to {filepath}")
+            logger.info("Exported fire summary to %s", filepath)
             return filepath
             
         except Exception as e:
-            logger.error(f"Failed to export fire summary: {e}")
+            logger.error("Failed to export fire summary: %s", e)
             return ""
     
     def export_alert_report(
         self, 
         detections: List[Dict],
         alert_recipients: List[str],
-        filename: str = None
+        filename: str = None,
+        include_details: bool = True,
+        pretty_print: bool = False,
+        stream: bool = False,
+        columnar: bool = False
     ) -> str:
         """
         Export an alert report showing what would be sent via email
@@ -258,6 +483,12 @@ class DataExporter:
             detections: List of high-confidence detections
             alert_recipients: List of email recipients
             filename: Output filename (optional)
+            include_details: Whether to embed the per-detection details
+            pretty_print: Whether to format JSON with indentation
+            stream: Write the details element by element to bound memory
+                (always compact, the details become the last key)
+            columnar: Write the details as an object of per-field arrays
+                instead of one object per detection (not streamed)
             
         Returns:
             str: Path to exported file
@@ -267,18 +498,19 @@ class DataExporter:
                 logger.warning("No detections for alert report")
                 return ""
             
-            if filename is None:
-                filename = f"alert_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            # One clock read so the filename and report timestamp agree
+            now = datetime.now()
             
-            filepath = os.path.join(self.export_dir, filename)
+            filepath = self._resolve_path("alert_report", "json", filename, now=now)
             
             # Calculate alert statistics
-            total_power = sum(d.get('power_mw', 0) for d in detections)
-            avg_confidence = sum(d.get('confidence', 0) for d in detections) / len(detections)
+            columns = self._to_soa(detections, ['confidence', 'power_mw'], default=0)
+            total_power = sum(columns['power_mw'])
+            avg_confidence = sum(columns['confidence']) / len(detections)
             
             alert_report = {
                 "alert_metadata": {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now.isoformat(),
                     "recipients": alert_recipients,
                     "total_detections": len(detections),
                     "alert_type": "High-Confidence Fire Alert"
@@ -287,39 +519,51 @@ class DataExporter:
                     "total_thermal_power_mw": round(total_power, 2),
                     "average_confidence": round(avg_confidence, 2),
                     "high_confidence_count": len(detections)
-                },
-                "detection_details": [
-                    {
-                        "latitude": d.get('latitude'),
-                        "longitude": d.get('longitude'),
-                        "confidence": d.get('confidence'),
-                        "power_mw": d.get('power_mw'),
-                        "distance_km": d.get('distance_km'),
-                        "source": d.get('source'),
-                        "timestamp": d.get('timestamp')
-                    }
-                    for d in detections
-                ],
-                "email_content_preview": {
-                    "subject": f"🔥 High-Confidence Fire Alert - {len(detections)} Fires Detected",
-                    "body_preview": "HTML email content would be generated here"
                 }
             }
             
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                json.dump(alert_report, jsonfile, indent=AppConfig.export.json_indent, ensure_ascii=False)
+            details = (
+                {
+                    "latitude": d.get('latitude'),
+                    "longitude": d.get('longitude'),
+                    "confidence": d.get('confidence'),
+                    "power_mw": d.get('power_mw'),
+                    "distance_km": d.get('distance_km'),
+                    "source": d.get('source'),
+                    "timestamp": d.get('timestamp')
+                }
+                for d in detections
+            )
+            if include_details and columnar:
+                # One list per field; no per-detection dict is built
+                alert_report["detection_details"] = self._to_soa(detections, ALERT_FIELDS)
+            elif include_details and not stream:
+                alert_report["detection_details"] = list(details)
+            
+            alert_report["email_content_preview"] = {
+                "subject": f"🔥 High-Confidence Fire Alert - {len(detections)} Fires Detected",
+                "body_preview": "HTML email content would be generated here"
+            }
+            
+            if include_details and stream and not columnar:
+                _dump_streamed(alert_report, filepath, "detection_details", details)
+            else:
+                _dump(alert_report, filepath, AppConfig.export.json_indent if pretty_print else None)
             
-            logger.info(f"Exported alert report to {filepath}")
+            logger.info("Exported alert report to %s", filepath)
             return filepath
             
         except Exception as e:
-            logger.error(f"Failed to export alert report: {e}")
+            logger.error("Failed to export alert report: %s", e)
             return ""
     
     def export_historical_trends(
         self, 
         detections: List[Dict],
-        filename: str = None
+        filename: str = None,
+        include_details: bool = True,
+        pretty_print: bool = False,
+        stream: bool = False
     ) -> str:
         """
         Export historical trends analysis
@@ -327,6 +571,12 @@ class DataExporter:
         Args:
             detections: List of historical detection data
             filename: Output filename (optional)
+            include_details: Whether to embed the full detection list
+            pretty_print: Whether to format JSON with indentation
+            stream: Write the details element by element to bound memory
+                (always compact, the details become the last key)
+            columnar: Write the details as an object of per-field arrays
+                instead of one object per detection (not streamed)
             
         Returns:
             str: Path to exported file
@@ -336,19 +586,14 @@ class DataExporter:
                 logger.warning("No historical data for trends analysis")
                 return ""
             
-            if filename is None:
-                filename = f"historical_trends_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            
-            filepath = os.path.join(self.export_dir, filename)
+            filepath = self._resolve_path("historical_trends", "json", filename)
             
             # Analyze trends by time
-            time_groups = {}
+            time_groups = defaultdict(list)
             for detection in detections:
                 time_str = detection.get('detection_time', '')
                 if time_str:
                     date = time_str.split('T')[0]  # Get date part
-                    if date not in time_groups:
-                        time_groups[date] = []
                     time_groups[date].append(detection)
             
             # Calculate daily statistics
@@ -373,18 +618,21 @@ class DataExporter:
                     "average_detections_per_day": round(len(detections) / len(time_groups), 2) if time_groups else 0,
                     "peak_detection_day": max(daily_stats.items(), key=lambda x: x[1]['total_detections']) if daily_stats else None,
                     "highest_confidence_day": max(daily_stats.items(), key=lambda x: x[1]['average_confidence']) if daily_stats else None
-                },
-                "detection_data": detections
+                }
             }
             
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                json.dump(trends_report, jsonfile, indent=AppConfig.export.json_indent, ensure_ascii=False)
+            if include_details and stream and not columnar:
+                _dump_streamed(trends_report, filepath, "detection_data", detections)
+            else:
+                if include_details:
+                    trends_report["detection_data"] = detections
+                _dump(trends_report, filepath, AppConfig.export.json_indent if pretty_print else None)
             
-            logger.info(f"Exported historical trends to {filepath}")
+            logger.info("Exported historical trends to %s", filepath)
             return filepath
             
         except Exception as e:
-            logger.error(f"Failed to export historical trends: {e}")
+            logger.error("Failed to export historical trends: %s", e)
             return ""
     
     def batch_export(
@@ -410,27 +658,48 @@ class DataExporter:
             
             results = {}
             
-            for format_type in formats:
-                if format_type.lower() == 'csv':
-                    filename = f"{filename_base}.csv"
-                    results['csv'] = self.export_to_csv(data, filename)
-                
-                elif format_type.lower() == 'json':
-                    filename = f"{filename_base}.json"
-                    results['json'] = self.export_to_json(data, filename)
+            # Discover the schema and flatten the rows once for all writers
+            wanted = {format_type.lower() for format_type in formats}
+            prepared = None
+            if data and wanted & {'csv', 'excel'}:
+                prepared = self._prepare(data, with_frame='excel' in wanted)
+            
+            # The writers are independent and I/O bound, so run them side by side
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = {}
+                for format_type in formats:
+                    if format_type.lower() == 'csv':
+                        filename = f"{filename_base}.csv"
+                        futures['csv'] = executor.submit(
+                            self.export_to_csv, data, filename, prepared=prepared
+                        )
+                    
+                    elif format_type.lower() == 'json':
+                        filename = f"{filename_base}.json"
+                        futures['json'] = executor.submit(self.export_to_json, data, filename)
+                    
+                    elif format_type.lower() == 'excel':
+                        filename = f"{filename_base}.xlsx"
+                        futures['excel'] = executor.submit(
+                            self.export_to_excel, data, filename, prepared=prepared
+                        )
+                    
+                    else:
+                        logger.warning("Unknown export format: %s", format_type)
                 
-                elif format_type.lower() == 'excel':
-                    filename = f"{filename_base}.xlsx"
-                    results['excel'] = self.export_to_excel(data, filename)
-                
-                else:
-                    logger.warning(f"Unknown export format: {format_type}")
-            
-            logger.info(f"Batch export completed: {list(results.keys())}")
+                # A failing writer must not take the other formats down with it
+                for format_type, future in futures.items():
+                    try:
+                        results[format_type] = future.result()
+                    except Exception as e:
+                        logger.error("Failed to export %s: %s", format_type, e)
+                        results[format_type] = ""
+            
+            logger.info("Batch export completed: %s", list(results.keys()))
             return results
             
         except Exception as e:
-            logger.error(f"Failed batch export: {e}")
+            logger.error("Failed batch export: %s", e)
             return {}
 
 # Global data exporter instance
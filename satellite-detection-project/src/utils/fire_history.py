@@ -2,33 +2,160 @@
 Historical fire data tracking and storage system
 """
 
+import asyncio
 import sqlite3
 import json
 import csv
 import os
+import threading
+import calendar
+from contextlib import contextmanager
+from math import radians, cos, sin, asin, sqrt
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 from dataclasses import asdict
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..config import AppConfig
 
 logger = logging.getLogger(__name__)
 
+# Connection-scoped tuning applied on every open; journal_mode=WAL is
+# persistent in the database file and only set once in _init_database
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Shared by the single and batch inserts so sqlite3's per-connection
+# statement cache prepares it only once. detection_ts is derived from the
+# detection_time parameter (?1) as integer epoch seconds. Detections already
+# recorded (same acquisition time, location and source) are skipped through
+# idx_fires_dedup; only that conflict is ignored, other constraint
+# violations still raise. Rows without an acquisition time (NULL) never
+# conflict and are always inserted.
+INSERT_FIRE_SQL = '''
+    INSERT INTO fires (
+        detection_time, latitude, longitude, confidence, power_mw,
+        distance_km, source, search_radius_km, center_lat, center_lon,
+        acquisition_time, detection_ts
+    ) VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11, CAST(strftime('%s', ?1) AS INTEGER))
+    ON CONFLICT (acquisition_time, latitude, longitude, source) DO NOTHING
+'''
+
+# Looks up the stored row a skipped insert record duplicates through
+# idx_fires_dedup
+FIND_FIRE_SQL = '''
+    SELECT id FROM fires
+    WHERE acquisition_time = ? AND latitude = ? AND longitude = ? AND source = ?
+'''
+
+# Old records are deleted this many rows per transaction so the write lock
+# is released between chunks and the WAL stays small
+CLEANUP_CHUNK_SIZE = 10000
+
+# Exports stream rows from the cursor in chunks of EXPORT_FETCH_SIZE into a
+# file buffer of EXPORT_BUFFER_SIZE bytes instead of materializing the table
+EXPORT_FETCH_SIZE = 1000
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Columns returned by the detection queries, in order
+DETECTION_COLUMNS = '''
+    id, detection_time, latitude, longitude, confidence,
+    power_mw, distance_km, source, search_radius_km,
+    center_lat, center_lon, alert_sent, alert_time, created_at
+'''
+
+def _acquisition_key(detection: Dict) -> Optional[str]:
+    """
+    Time that identifies a detection for deduplication
+    
+    The caller's timestamp when given, otherwise the FIRMS acquisition_date
+    and acquisition_time (HHMM, UTC) as reported. Only compared for
+    equality, never against time windows.
+    
+    Returns:
+        Optional[str]: Key, or None when the detection carries no time of its own
+    """
+    timestamp = detection.get('timestamp')
+    if timestamp:
+        return timestamp
+    acquisition_date = detection.get('acquisition_date')
+    if not acquisition_date:
+        return None
+    hhmm = str(detection.get('acquisition_time') or 0).zfill(4)
+    return f"{acquisition_date}T{hhmm[:2]}:{hhmm[2:4]}:00Z"
+
 class FireHistoryTracker:
     """Tracks and stores historical fire detection data"""
     
     def __init__(self):
         self.db_path = AppConfig.database.db_path
         self.max_history_days = AppConfig.database.max_history_days
+        self._local = threading.local()
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the history database with tuned PRAGMAs"""
+        # Autocommit mode; writes open their own transactions in _transaction
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        conn.create_function('haversine', 4, self._haversine_distance, deterministic=True)
+        return conn
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed writes in one BEGIN IMMEDIATE ... COMMIT block"""
+        conn = self._get_conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    
+    def close(self):
+        """Close the calling thread's database connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
     def _init_database(self):
         """Initialize SQLite database for fire history"""
         try:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
+            # Write-ahead logging lets readers proceed during writes and
+            # avoids an fsync of the main file on every commit
+            self._get_conn().execute('PRAGMA journal_mode=WAL')
+            
+            compile_options = {row[0] for row in self._get_conn().execute('PRAGMA compile_options')}
+            self._has_rtree = 'ENABLE_RTREE' in compile_options
+            if not self._has_rtree:
+                logger.warning("SQLite built without R-tree support, location queries will scan")
+            
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 
                 # Create fires table
@@ -47,22 +174,88 @@ class FireHistoryTracker:
                         center_lon REAL,
                         alert_sent BOOLEAN DEFAULT 0,
                         alert_time TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                        detection_ts INTEGER,
+                        acquisition_time TEXT
                     )
                 ''')
                 
-                # Create indexes for better performance
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_fires_time ON fires(detection_time)')
+                # Databases created before detection_ts existed get the
+                # column added and backfilled from detection_time
+                cursor.execute('PRAGMA table_info(fires)')
+                columns = {row[1] for row in cursor.fetchall()}
+                if 'detection_ts' not in columns:
+                    cursor.execute('ALTER TABLE fires ADD COLUMN detection_ts INTEGER')
+                    cursor.execute('''
+                        UPDATE fires SET detection_ts = CAST(strftime('%s', detection_time) AS INTEGER)
+                    ''')
+                if 'acquisition_time' not in columns:
+                    cursor.execute('ALTER TABLE fires ADD COLUMN acquisition_time TEXT')
+                
+                # Create indexes for better performance; time ranges are
+                # scanned on the integer column, not the ISO text, with
+                # confidence alongside so recent-detection filters are
+                # checked inside the index instead of per table row
+                cursor.execute('DROP INDEX IF EXISTS idx_fires_time')
+                cursor.execute('DROP INDEX IF EXISTS idx_fires_ts')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_fires_ts_conf ON fires(detection_ts DESC, confidence)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_fires_coords ON fires(latitude, longitude)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_fires_confidence ON fires(confidence)')
                 
-                conn.commit()
+                # Repeated detections are ignored on insert, keyed on the
+                # acquisition time. Existing rows have none (NULL never
+                # conflicts), so replacing an older index deletes nothing.
+                cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_fires_dedup'")
+                row = cursor.fetchone()
+                if row is None or 'acquisition_time' not in row[0]:
+                    if row is not None:
+                        logger.info("Rebuilding idx_fires_dedup on acquisition_time")
+                    cursor.execute('DROP INDEX IF EXISTS idx_fires_dedup')
+                    cursor.execute('''
+                        CREATE UNIQUE INDEX idx_fires_dedup
+                        ON fires(acquisition_time, latitude, longitude, source)
+                    ''')
+                
+                if self._has_rtree:
+                    self._init_spatial_index(cursor)
+                
                 logger.info(f"Fire history database initialized at {self.db_path}")
                 
         except Exception as e:
             logger.error(f"Failed to initialize fire history database: {e}")
             raise
     
+    def _init_spatial_index(self, cursor: sqlite3.Cursor):
+        """Create the R-tree over fire locations and the triggers keeping it in sync"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'fires_rtree'")
+        created = cursor.fetchone() is None
+        
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS fires_rtree
+            USING rtree(id, min_lat, max_lat, min_lon, max_lon)
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS fires_rtree_insert AFTER INSERT ON fires
+            BEGIN
+                INSERT INTO fires_rtree VALUES (
+                    new.id, new.latitude, new.latitude, new.longitude, new.longitude
+                );
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS fires_rtree_delete AFTER DELETE ON fires
+            BEGIN
+                DELETE FROM fires_rtree WHERE id = old.id;
+            END
+        ''')
+        
+        # Index rows written before the R-tree existed
+        if created:
+            cursor.execute('''
+                INSERT INTO fires_rtree
+                SELECT id, latitude, latitude, longitude, longitude FROM fires
+            ''')
+    
     def add_detection(
         self, 
         detection: Dict,
@@ -80,37 +273,7 @@ class FireHistoryTracker:
         Returns:
             int: ID of inserted record
         """
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    INSERT INTO fires (
-                        detection_time, latitude, longitude, confidence, power_mw,
-                        distance_km, source, search_radius_km, center_lat, center_lon
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    detection.get('timestamp', datetime.now().isoformat()),
-                    detection.get('latitude', 0),
-                    detection.get('longitude', 0),
-                    detection.get('confidence', 0),
-                    detection.get('power_mw', 0),
-                    detection.get('distance_km', 0),
-                    detection.get('source', 'Unknown'),
-                    search_radius_km,
-                    center_coordinates[0],
-                    center_coordinates[1]
-                ))
-                
-                record_id = cursor.lastrowid
-                conn.commit()
-                
-                logger.debug(f"Added fire detection record {record_id}")
-                return record_id
-                
-        except Exception as e:
-            logger.error(f"Failed to add fire detection to history: {e}")
-            raise
+        return self.add_detections_batch([detection], search_radius_km, center_coordinates)[0]
     
     def add_detections_batch(
         self, 
@@ -130,46 +293,110 @@ class FireHistoryTracker:
             List[int]: IDs of inserted records
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Prepare batch insert
-                records = []
-                for detection in detections:
-                    records.append((
-                        detection.get('timestamp', datetime.now().isoformat()),
-                        detection.get('latitude', 0),
-                        detection.get('longitude', 0),
-                        detection.get('confidence', 0),
-                        detection.get('power_mw', 0),
-                        detection.get('distance_km', 0),
-                        detection.get('source', 'Unknown'),
-                        search_radius_km,
-                        center_coordinates[0],
-                        center_coordinates[1]
-                    ))
-                
-                cursor.executemany('''
-                    INSERT INTO fires (
-                        detection_time, latitude, longitude, confidence, power_mw,
-                        distance_km, source, search_radius_km, center_lat, center_lon
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', records)
-                
-                conn.commit()
-                
-                # Get inserted IDs
-                cursor.execute('SELECT last_insert_rowid()')
-                last_id = cursor.fetchone()[0]
-                record_ids = list(range(last_id - len(records) + 1, last_id + 1))
-                
-                logger.info(f"Added {len(records)} fire detections to history")
-                return record_ids
+            # Prepare batch insert before taking the write lock
+            records = self._build_records(detections, search_radius_km, center_coordinates)
+            record_ids = self._insert_records(records)
+            
+            logger.info(f"Added {len(records)} fire detections to history")
+            return record_ids
                 
         except Exception as e:
             logger.error(f"Failed to add batch fire detections to history: {e}")
             raise
     
+    async def add_detections_batch_async(
+        self, 
+        detections: List[Dict],
+        search_radius_km: float,
+        center_coordinates: List[float]
+    ) -> List[int]:
+        """
+        Add multiple fire detections to history without blocking the event loop
+        
+        Runs add_detections_batch in a worker thread, which writes through
+        that thread's own connection.
+        
+        Args:
+            detections: List of fire detection data
+            search_radius_km: Search radius used
+            center_coordinates: [lat, lon] of search center
+            
+        Returns:
+            List[int]: IDs of inserted records
+        """
+        return await asyncio.to_thread(
+            self.add_detections_batch, detections, search_radius_km, center_coordinates
+        )
+    
+    @staticmethod
+    def _build_records(
+        detections: List[Dict],
+        search_radius_km: float,
+        center_coordinates: List[float]
+    ) -> List[tuple]:
+        """Convert detections into INSERT_FIRE_SQL parameter tuples"""
+        # Default timestamp and search center are the same for every row
+        now = datetime.now().isoformat()
+        center_lat, center_lon = center_coordinates[0], center_coordinates[1]
+        return [
+            (
+                detection.get('timestamp', now),
+                detection.get('latitude', 0),
+                detection.get('longitude', 0),
+                detection.get('confidence', 0),
+                detection.get('power_mw', 0),
+                detection.get('distance_km', 0),
+                detection.get('source', 'Unknown'),
+                search_radius_km,
+                center_lat,
+                center_lon,
+                _acquisition_key(detection)
+            )
+            for detection in detections
+        ]
+    
+    def _insert_records(self, records) -> List[int]:
+        """
+        Insert prepared records in one transaction and return their IDs
+        
+        Records that duplicate an existing detection are not inserted again;
+        the ID of the stored detection is returned for them instead.
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SAVEPOINT insert_batch')
+            cursor.executemany(INSERT_FIRE_SQL, records)
+            inserted = cursor.rowcount
+            
+            # Without duplicates the new rows hold consecutive IDs
+            if inserted == len(records):
+                cursor.execute('RELEASE insert_batch')
+                cursor.execute('SELECT last_insert_rowid()')
+                last_id = cursor.fetchone()[0]
+                return list(range(last_id - len(records) + 1, last_id + 1))
+            
+            # Otherwise redo the batch row by row to tell which records were
+            # inserted and which map to a stored detection
+            logger.debug(f"Skipped {len(records) - inserted} duplicate fire detections")
+            cursor.execute('ROLLBACK TO insert_batch')
+            cursor.execute('RELEASE insert_batch')
+            record_ids = []
+            for record in records:
+                cursor.execute(INSERT_FIRE_SQL, record)
+                if cursor.rowcount:
+                    record_ids.append(cursor.lastrowid)
+                else:
+                    cursor.execute(FIND_FIRE_SQL, (record[10], record[1], record[2], record[6]))
+                    row = cursor.fetchone()
+                    if row is None:
+                        raise sqlite3.IntegrityError(
+                            f"Fire detection at ({record[1]}, {record[2]}) was not inserted "
+                            "and matches no stored detection"
+                        )
+                    record_ids.append(row[0])
+            return record_ids
+    
     def get_recent_detections(
         self, 
         hours: int = 24,
@@ -190,24 +417,22 @@ class FireHistoryTracker:
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT id, detection_time, latitude, longitude, confidence, 
-                           power_mw, distance_km, source, search_radius_km, 
-                           center_lat, center_lon, alert_sent, alert_time, created_at
-                    FROM fires 
-                    WHERE detection_time >= ? AND confidence >= ?
-                    ORDER BY detection_time DESC
-                    LIMIT ?
-                ''', (cutoff_time.isoformat(), min_confidence, limit))
-                
-                columns = [desc[0] for desc in cursor.description]
-                records = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                
-                return records
-                
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT {DETECTION_COLUMNS}
+                FROM fires 
+                WHERE detection_ts >= ? AND confidence >= ?
+                ORDER BY detection_ts DESC
+                LIMIT ?
+            ''', (self._epoch(cutoff_time), min_confidence, limit))
+            
+            columns = [desc[0] for desc in cursor.description]
+            records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+            return records
+            
         except Exception as e:
             logger.error(f"Failed to get recent detections: {e}")
             return []
@@ -234,43 +459,61 @@ class FireHistoryTracker:
         try:
             cutoff_time = datetime.now() - timedelta(days=days)
             
-            # Simple distance calculation for filtering
-            # In a real implementation, you might want to use spatial indexing
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT id, detection_time, latitude, longitude, confidence, 
-                           power_mw, distance_km, source, search_radius_km, 
-                           center_lat, center_lon, alert_sent, alert_time, created_at
-                    FROM fires 
-                    WHERE detection_time >= ? 
-                    AND center_lat BETWEEN ? AND ?
-                    AND center_lon BETWEEN ? AND ?
-                    ORDER BY detection_time DESC
-                ''', (
-                    cutoff_time.isoformat(),
-                    latitude - (radius_km / 111.0),
-                    latitude + (radius_km / 111.0),
-                    longitude - (radius_km / 111.0),
-                    longitude + (radius_km / 111.0)
-                ))
-                
-                columns = [desc[0] for desc in cursor.description]
-                records = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                
-                # Filter by actual distance
-                filtered_records = []
-                for record in records:
-                    dist = self._haversine_distance(
-                        latitude, longitude, 
-                        record['latitude'], record['longitude']
+            # Bounding box around the center; longitude degrees shrink
+            # towards the poles so widen the box accordingly
+            lat_delta = radius_km / 111.0
+            lon_scale = cos(radians(min(abs(latitude) + lat_delta, 90.0)))
+            lon_delta = radius_km / (111.0 * lon_scale) if lon_scale > 1e-6 else 180.0
+            box = (
+                latitude - lat_delta, latitude + lat_delta,
+                longitude - lon_delta, longitude + lon_delta
+            )
+            
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            
+            if self._has_rtree:
+                # R-tree prunes to the box, haversine() gives the exact cut
+                cursor.execute(f'''
+                    SELECT {DETECTION_COLUMNS}
+                    FROM fires
+                    WHERE id IN (
+                        SELECT id FROM fires_rtree
+                        WHERE max_lat >= ? AND min_lat <= ?
+                        AND max_lon >= ? AND min_lon <= ?
                     )
-                    if dist <= radius_km:
-                        filtered_records.append(record)
-                
-                return filtered_records
+                    AND detection_ts >= ?
+                    AND haversine(?, ?, latitude, longitude) <= ?
+                    ORDER BY detection_ts DESC
+                ''', (*box, self._epoch(cutoff_time), latitude, longitude, radius_km))
                 
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+            cursor.execute(f'''
+                SELECT {DETECTION_COLUMNS}
+                FROM fires 
+                WHERE detection_ts >= ? 
+                AND latitude BETWEEN ? AND ?
+                AND longitude BETWEEN ? AND ?
+                ORDER BY detection_ts DESC
+            ''', (self._epoch(cutoff_time), *box))
+            
+            columns = [desc[0] for desc in cursor.description]
+            records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            
+            if not records:
+                return records
+            
+            # Filter by actual distance, vectorized over all candidates
+            lats = np.radians(np.fromiter((r['latitude'] for r in records), dtype=np.float64, count=len(records)))
+            lons = np.radians(np.fromiter((r['longitude'] for r in records), dtype=np.float64, count=len(records)))
+            lat0, lon0 = radians(latitude), radians(longitude)
+            a = np.sin((lats - lat0) / 2) ** 2 + cos(lat0) * np.cos(lats) * np.sin((lons - lon0) / 2) ** 2
+            distances = 2 * 6371 * np.arcsin(np.sqrt(a))
+            
+            return [record for record, keep in zip(records, distances <= radius_km) if keep]
+            
         except Exception as e:
             logger.error(f"Failed to get detections by location: {e}")
             return []
@@ -278,7 +521,7 @@ class FireHistoryTracker:
     def mark_alert_sent(self, detection_id: int) -> bool:
         """Mark a detection as having an alert sent"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -287,7 +530,6 @@ class FireHistoryTracker:
                     WHERE id = ?
                 ''', (datetime.now().isoformat(), detection_id))
                 
-                conn.commit()
                 return cursor.rowcount > 0
                 
         except Exception as e:
@@ -297,20 +539,32 @@ class FireHistoryTracker:
     def cleanup_old_records(self) -> int:
         """Remove old records beyond retention period"""
         try:
-            cutoff_time = datetime.now() - timedelta(days=self.max_history_days)
+            cutoff_ts = self._epoch(datetime.now() - timedelta(days=self.max_history_days))
+            deleted_count = 0
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    DELETE FROM fires WHERE detection_time < ?
-                ''', (cutoff_time.isoformat(),))
-                
-                deleted_count = cursor.rowcount
-                conn.commit()
-                
-                logger.info(f"Cleaned up {deleted_count} old fire records")
-                return deleted_count
+            while True:
+                with self._transaction() as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                        DELETE FROM fires WHERE id IN (
+                            SELECT id FROM fires WHERE detection_ts < ? LIMIT ?
+                        )
+                    ''', (cutoff_ts, CLEANUP_CHUNK_SIZE))
+                    
+                    deleted_count += cursor.rowcount
+                
+                if cursor.rowcount < CLEANUP_CHUNK_SIZE:
+                    break
+            
+            # Copy the deletes into the main file and truncate the -wal file;
+            # the freed pages stay in the database for reuse by later inserts
+            # (only VACUUM would shrink the main file)
+            if deleted_count:
+                self._get_conn().execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            
+            logger.info(f"Cleaned up {deleted_count} old fire records")
+            return deleted_count
                 
         except Exception as e:
             logger.error(f"Failed to cleanup old records: {e}")
@@ -321,59 +575,53 @@ class FireHistoryTracker:
         try:
             cutoff_time = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Total detections
-                cursor.execute('''
-                    SELECT COUNT(*) FROM fires WHERE detection_time >= ?
-                ''', (cutoff_time.isoformat(),))
-                total_detections = cursor.fetchone()[0]
-                
-                # High confidence detections
-                cursor.execute('''
-                    SELECT COUNT(*) FROM fires 
-                    WHERE detection_time >= ? AND confidence >= 0.8
-                ''', (cutoff_time.isoformat(),))
-                high_conf_detections = cursor.fetchone()[0]
-                
-                # Average confidence
-                cursor.execute('''
-                    SELECT AVG(confidence) FROM fires WHERE detection_time >= ?
-                ''', (cutoff_time.isoformat(),))
-                avg_confidence = cursor.fetchone()[0] or 0
-                
-                # Total thermal power
-                cursor.execute('''
-                    SELECT SUM(power_mw) FROM fires WHERE detection_time >= ?
-                ''', (cutoff_time.isoformat(),))
-                total_power = cursor.fetchone()[0] or 0
-                
-                # Alerts sent
-                cursor.execute('''
-                    SELECT COUNT(*) FROM fires 
-                    WHERE detection_time >= ? AND alert_sent = 1
-                ''', (cutoff_time.isoformat(),))
-                alerts_sent = cursor.fetchone()[0]
-                
-                return {
-                    'total_detections': total_detections,
-                    'high_confidence_detections': high_conf_detections,
-                    'average_confidence': round(avg_confidence, 2),
-                    'total_thermal_power_mw': round(total_power, 2),
-                    'alerts_sent': alerts_sent,
-                    'period_days': days,
-                    'last_updated': datetime.now().isoformat()
-                }
-                
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            
+            # All aggregates in one pass over the time range
+            cursor.execute('''
+                SELECT COUNT(*),
+                       SUM(CASE WHEN confidence >= 0.8 THEN 1 ELSE 0 END),
+                       AVG(confidence),
+                       SUM(power_mw),
+                       SUM(CASE WHEN alert_sent = 1 THEN 1 ELSE 0 END)
+                FROM fires WHERE detection_ts >= ?
+            ''', (self._epoch(cutoff_time),))
+            (total_detections, high_conf_detections, avg_confidence,
+             total_power, alerts_sent) = cursor.fetchone()
+            
+            # SUM and AVG are NULL over an empty range
+            high_conf_detections = high_conf_detections or 0
+            avg_confidence = avg_confidence or 0
+            total_power = total_power or 0
+            alerts_sent = alerts_sent or 0
+            
+            return {
+                'total_detections': total_detections,
+                'high_confidence_detections': high_conf_detections,
+                'average_confidence': round(avg_confidence, 2),
+                'total_thermal_power_mw': round(total_power, 2),
+                'alerts_sent': alerts_sent,
+                'period_days': days,
+                'last_updated': datetime.now().isoformat()
+            }
+            
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
             return {}
     
+    @staticmethod
+    def _epoch(dt: datetime) -> int:
+        """
+        Convert a datetime to the integer seconds stored in detection_ts
+        
+        Naive datetimes are read as UTC, matching SQLite's strftime('%s')
+        applied to the naive ISO strings stored in detection_time.
+        """
+        return calendar.timegm(dt.utctimetuple())
+    
     def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate distance between two points using Haversine formula"""
-        from math import radians, cos, sin, asin, sqrt
-        
         lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
         dlon = lon2 - lon1
         dlat = lat2 - lat1
@@ -391,26 +639,29 @@ class FireHistoryTracker:
             filepath = os.path.join(AppConfig.export.export_dir, filename)
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT detection_time, latitude, longitude, confidence, 
-                           power_mw, distance_km, source, search_radius_km, 
-                           center_lat, center_lon, alert_sent, alert_time, created_at
-                    FROM fires ORDER BY detection_time DESC
-                ''')
-                
-                columns = [desc[0] for desc in cursor.description]
-                
-                with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(columns)
-                    writer.writerows(cursor.fetchall())
-                
-                logger.info(f"Exported fire history to {filepath}")
-                return filepath
-                
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT detection_time, latitude, longitude, confidence, 
+                       power_mw, distance_km, source, search_radius_km, 
+                       center_lat, center_lon, alert_sent, alert_time, created_at
+                FROM fires ORDER BY detection_ts DESC
+            ''')
+            
+            columns = [desc[0] for desc in cursor.description]
+            cursor.arraysize = EXPORT_FETCH_SIZE
+            
+            with open(filepath, 'w', newline='', encoding='utf-8',
+                      buffering=EXPORT_BUFFER_SIZE) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(columns)
+                for rows in iter(cursor.fetchmany, []):
+                    writer.writerows(rows)
+            
+            logger.info(f"Exported fire history to {filepath}")
+            return filepath
+            
         except Exception as e:
             logger.error(f"Failed to export fire history to CSV: {e}")
             return ""
@@ -424,10 +675,36 @@ class FireHistoryTracker:
             filepath = os.path.join(AppConfig.export.export_dir, filename)
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            detections = self.get_recent_detections(hours=24*365)  # All data
+            # Same selection as get_recent_detections(hours=24*365), streamed
+            # from the cursor instead of built into a list first
+            cutoff_time = datetime.now() - timedelta(hours=24*365)
+            
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            
+            cursor.execute(f'''
+                SELECT {DETECTION_COLUMNS}
+                FROM fires 
+                WHERE detection_ts >= ? AND confidence >= ?
+                ORDER BY detection_ts DESC
+                LIMIT ?
+            ''', (self._epoch(cutoff_time), 0.5, 1000))
+            
+            columns = [desc[0] for desc in cursor.description]
+            cursor.arraysize = EXPORT_FETCH_SIZE
+            dumps = orjson.dumps if orjson is not None else (lambda obj: json.dumps(obj).encode())
             
-            with open(filepath, 'w', encoding='utf-8') as jsonfile:
-                json.dump(detections, jsonfile, indent=AppConfig.export.json_indent)
+            # One compact record per line inside a JSON array, so the file
+            # stays valid JSON while each row is encoded and written on its own
+            with open(filepath, 'wb', buffering=EXPORT_BUFFER_SIZE) as jsonfile:
+                jsonfile.write(b'[')
+                separator = b'\n'
+                for rows in iter(cursor.fetchmany, []):
+                    for row in rows:
+                        jsonfile.write(separator)
+                        jsonfile.write(dumps(dict(zip(columns, row))))
+                        separator = b',\n'
+                jsonfile.write(b'\n]\n')
             
             logger.info(f"Exported fire history to {filepath}")
             return filepath
@@ -6,35 +6,61 @@ import cv2
 from datetime import datetime, timedelta
 import logging
 import hashlib
+from collections import OrderedDict
 from functools import lru_cache
-import pickle
 from .web_scraper import NASAWorldviewScraper
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
 class ImageCache:
     """Simple cache for satellite images"""
-    def __init__(self, cache_dir: str = ".image_cache", max_size: int = 100):
+    def __init__(self, cache_dir: str = ".image_cache", max_size: int = 100, memory_size: int = 8):
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.max_size = max_size
-        self.access_times = {}
+        # Keys in least- to most-recently used order
+        self.access_times = OrderedDict()
+        # Small in-process LRU of decoded images in front of the disk cache
+        self.memory_size = memory_size
+        self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
 
     def _get_cache_key(self, **kwargs) -> str:
         """Generate cache key from parameters"""
         key_str = str(sorted(kwargs.items()))
-        return hashlib.md5(key_str.encode()).hexdigest()
+        if xxhash is not None:
+            return xxhash.xxh3_64_hexdigest(key_str)
+        # blake2b is the fastest stdlib digest on 64-bit hosts
+        return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+
+    def _cache_path(self, cache_key: str) -> Path:
+        """Path of the stored image for a cache key"""
+        # Raw .npy keeps cached pixels identical to the fetched image and
+        # loads with a header parse plus one read, no image codec involved
+        return self.cache_dir / f"{cache_key}.npy"
 
     def get(self, **kwargs) -> Optional[np.ndarray]:
         """Get image from cache"""
         try:
             cache_key = self._get_cache_key(**kwargs)
-            cache_path = self.cache_dir / f"{cache_key}.pkl"
+            image = self._mem.get(cache_key)
+            if image is not None:
+                self._mem.move_to_end(cache_key)
+                self._touch(cache_key)
+                # Callers may draw on the result; keep the cached pixels intact
+                return image.copy()
+
+            cache_path = self._cache_path(cache_key)
 
             if cache_path.exists():
-                self.access_times[cache_key] = datetime.now()
-                with open(cache_path, 'rb') as f:
-                    return pickle.load(f)
+                self._touch(cache_key)
+                image = np.load(cache_path, allow_pickle=False)
+                self._remember(cache_key, image.copy())
+                return image
         except Exception as e:
             logger.warning(f"Cache read error: {e}")
         return None
@@ -43,22 +69,35 @@ class ImageCache:
         """Store image in cache"""
         try:
             cache_key = self._get_cache_key(**kwargs)
-            cache_path = self.cache_dir / f"{cache_key}.pkl"
+            cache_path = self._cache_path(cache_key)
 
-            with open(cache_path, 'wb') as f:
-                pickle.dump(image, f)
-            self.access_times[cache_key] = datetime.now()
+            np.save(cache_path, image, allow_pickle=False)
+            self._touch(cache_key)
+            self._remember(cache_key, image.copy())
         except Exception as e:
             logger.warning(f"Cache write error: {e}")
 
+    def _touch(self, cache_key: str):
+        """Mark a cache entry as most recently used"""
+        self.access_times[cache_key] = datetime.now()
+        self.access_times.move_to_end(cache_key)
+
+    def _remember(self, cache_key: str, image: np.ndarray):
+        """Keep a decoded image in the bounded in-memory LRU"""
+        if self.memory_size <= 0:
+            return
+        self._mem[cache_key] = image
+        self._mem.move_to_end(cache_key)
+        while len(self._mem) > self.memory_size:
+            self._mem.popitem(last=False)
+
     def clear_old(self):
         """Remove least recently used cache entries"""
-        if len(self.access_times) > self.max_size:
-            oldest = min(self.access_times.items(), key=lambda x: x[1])
-            cache_path = self.cache_dir / f"{oldest[0]}.pkl"
+        while len(self.access_times) > self.max_size:
+            oldest, _ = self.access_times.popitem(last=False)
+            self._mem.pop(oldest, None)
             try:
-                cache_path.unlink()
-                del self.access_times[oldest[0]]
+                self._cache_path(oldest).unlink(missing_ok=True)
             except Exception as e:
                 logger.warning(f"Cache cleanup error: {e}")
 
@@ -190,30 +229,22 @@ def enhance_satellite_image(image: np.ndarray) -> np.ndarray:
     """Enhance satellite image for better visualization"""
     # Convert to LAB color space for illumination correction
     lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-    l, a, b = cv2.split(lab)
+    l = cv2.extractChannel(lab, 0)
 
-    # Apply CLAHE to L channel
+    # Apply CLAHE to L channel in place
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    l_enhanced = clahe.apply(l)
-
-    # Merge channels and convert back
-    lab_enhanced = cv2.merge([l_enhanced, a, b])
-    image_enhanced = cv2.cvtColor(lab_enhanced, cv2.COLOR_LAB2BGR)
+    clahe.apply(l, dst=l)
 
-    return image_enhanced
+    # Write L back into the LAB buffer (no split/merge copies) and convert back
+    lab = cv2.insertChannel(l, lab, 0)
+    return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=lab)
 
 def create_image_thumbnail(image: np.ndarray, max_size: int = 256) -> np.ndarray:
     """Create thumbnail of image"""
-    height, width = image.shape[:2]
-    if width > height:
-        new_width = max_size
-        new_height = int(height * (max_size / width))
-    else:
-        new_height = max_size
-        new_width = int(width * (max_size / height))
-
-    thumbnail = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
-    return thumbnail
+    scale = max_size / max(image.shape[:2])
+    # INTER_AREA avoids aliasing when shrinking; INTER_LINEAR is cheaper when enlarging
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=interpolation)
 
 # Global fetcher instance
 _fetcher = SatelliteImageFetcher(max_retries=3, timeout=30, enable_cache=True)
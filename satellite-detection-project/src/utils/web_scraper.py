@@ -1,58 +1,110 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from typing import Optional, List, Dict
 from datetime import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 import logging
 import numpy as np
 import cv2
 from io import BytesIO
 from PIL import Image
 
+# libjpeg-turbo decodes straight to BGR; the wrapper also needs the shared
+# library at runtime, so a missing library disables it like a missing package
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
 logger = logging.getLogger(__name__)
 
+# Connection pool per host, sized so concurrent layer fetches reuse
+# keep-alive TLS connections instead of opening new ones
+POOL_SIZE = 32
+
+# WMS GetMap parameters that do not depend on the requested layer image
+WMS_PARAMS = {
+    'service': 'WMS',
+    'version': '1.3.0',
+    'request': 'GetMap',
+    'width': '512',
+    'height': '512',
+    'crs': 'EPSG:4326',
+    'format': 'image/jpeg'
+}
+
+# Leading bytes of the image formats _decode_image reads (JPEG SOI, PNG,
+# GIF, TIFF, WebP); other bodies, such as WMS XML error documents, are
+# skipped without decoding
+IMAGE_SIGNATURES = (
+    b'\xff\xd8',
+    b'\x89PNG\r\n\x1a\n',
+    b'GIF87a', b'GIF89a',
+    b'II*\x00', b'MM\x00*',
+    b'RIFF'
+)
+
+# A 512x512 true-color frame with real data is well above this; smaller
+# images are the blank tiles served for dates without imagery
+MIN_IMAGE_BYTES = 4096
+
+# Transient HTTP statuses retried with exponential backoff (Retry-After is honored)
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+def _wms_query(lat: float, lon: float, date: str, layer: str) -> str:
+    """Encode the WMS GetMap query string for one layer request"""
+    return urlencode({
+        **WMS_PARAMS,
+        'layers': layer,
+        'bbox': f"{lon-0.5},{lat-0.5},{lon+0.5},{lat+0.5}",
+        'time': date
+    })
+
 class NASAWorldviewScraper:
     """Web scraper for NASA Worldview website to fetch satellite imagery"""
 
-    def __init__(self, base_url: str = "https://worldview.earthdata.nasa.gov", request_timeout: int = 30):
+    def __init__(self, base_url: str = "https://worldview.earthdata.nasa.gov", request_timeout: int = 30,
+                 session: Optional[requests.Session] = None):
         self.base_url = base_url
         self.request_timeout = request_timeout
-        self.session = requests.Session()
+        # An injected session is shared with the caller, who remains its owner
+        self._owns_session = session is None
+        self.session = session if session is not None else self._create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
-    def _construct_image_url(self, coordinates: List[float], date: str, layers: List[str]) -> str:
-        """Construct direct image download URL based on coordinates, date, and layers"""
-        try:
-            lat, lon = coordinates[0], coordinates[1]
-            
-            # Construct Worldview API URL for downloading snapshots
-            # This uses the snapshot API endpoint
-            url = f"{self.base_url}/api/v1/snapshot"
-            
-            # Prepare parameters for the snapshot request
-            params = {
-                'REQUEST': 'GetSnapshot',
-                'VERSION': '1.3.0',
-                'BBOX': f"{lon-0.5},{lat-0.5},{lon+0.5},{lat+0.5}",
-                'CRS': 'EPSG:4326',
-                'SRS': 'EPSG:4326',
-                'LAYERS': ','.join(layers),
-                'TIME': date,
-                'WIDTH': '512',
-                'HEIGHT': '512',
-                'FORMAT': 'image/jpeg',
-                'TRANSPARENT': 'false'
-            }
-            
-            # Return complete URL with parameters
-            query_string = '&'.join(f"{k}={v}" for k, v in params.items())
-            return f"{url}?{query_string}"
-            
-        except Exception as e:
-            logger.error(f"Error constructing image URL: {e}")
-            return None
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Create a session with a pooled, retrying transport adapter"""
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """Release pooled connections held by the session"""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def fetch_satellite_image(self, coordinates: List[float], date: str, 
                             layers: List[str] = None) -> Optional[np.ndarray]:
@@ -67,16 +119,27 @@ class NASAWorldviewScraper:
 
             logger.info(f"Fetching satellite image for coordinates {coordinates} on {date}")
 
-            # Try to get image from different services
-            for layer in layers:
-                try:
-                    image = self._fetch_from_layer(coordinates, date, layer)
-                    if image is not None:
-                        logger.info(f"Successfully fetched image from layer {layer}")
-                        return image
-                except Exception as e:
-                    logger.warning(f"Failed to fetch from layer {layer}: {e}")
-                    continue
+            # Request every layer at once over the pooled session, then take
+            # results in preference order; later layers are only waited on
+            # if all the earlier ones failed
+            executor = ThreadPoolExecutor(max_workers=min(len(layers), POOL_SIZE) or 1)
+            try:
+                futures = [
+                    executor.submit(self._fetch_from_layer, coordinates, date, layer)
+                    for layer in layers
+                ]
+                for layer, future in zip(layers, futures):
+                    try:
+                        image = future.result()
+                        if image is not None:
+                            logger.info(f"Successfully fetched image from layer {layer}")
+                            return image
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch from layer {layer}: {e}")
+                        continue
+            finally:
+                # Drop requests that have not started; in-flight ones finish in the background
+                executor.shutdown(wait=False, cancel_futures=True)
 
             logger.warning("Could not fetch image from any layer")
             return None
@@ -92,38 +155,52 @@ class NASAWorldviewScraper:
             lat, lon = coordinates[0], coordinates[1]
             
             # Use GIBS (Global Imagery Browse Services) or WorldView endpoints
-            url = f"{self.base_url}/geoserver/wms"
-            
-            params = {
-                'service': 'WMS',
-                'version': '1.3.0',
-                'request': 'GetMap',
-                'layers': layer,
-                'bbox': f"{lon-0.5},{lat-0.5},{lon+0.5},{lat+0.5}",
-                'width': '512',
-                'height': '512',
-                'crs': 'EPSG:4326',
-                'format': 'image/jpeg',
-                'time': date
-            }
-
-            response = self.session.get(url, params=params, timeout=self.request_timeout)
-            response.raise_for_status()
-
-            # Convert bytes to numpy array
-            image = Image.open(BytesIO(response.content))
-            image_array = np.array(image)
-            
-            # Convert RGB to BGR for OpenCV
-            if len(image_array.shape) == 3 and image_array.shape[2] == 3:
-                image_array = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
-            
-            return image_array
+            url = f"{self.base_url}/geoserver/wms?{_wms_query(lat, lon, date, layer)}"
+
+            with self.session.get(url, timeout=self.request_timeout, stream=True) as response:
+                response.raise_for_status()
+                # Read the body in one call rather than requests' 10 KB chunks
+                data = response.raw.read(decode_content=True)
+
+            # Skip decoding error documents and blank tiles so the caller
+            # moves straight on to the next layer
+            if len(data) < MIN_IMAGE_BYTES or not data.startswith(IMAGE_SIGNATURES):
+                logger.debug(f"Skipping layer {layer}: {len(data)} byte response without usable image data")
+                return None
+
+            return self._decode_image(data)
 
         except Exception as e:
             logger.debug(f"Error fetching from layer {layer}: {e}")
             return None
 
+    @staticmethod
+    def _decode_image(data: bytes) -> Optional[np.ndarray]:
+        """Decode image bytes straight to a BGR array"""
+        if _turbo_jpeg is not None:
+            try:
+                return _turbo_jpeg.decode(data, pixel_format=TJPF_BGR)
+            except Exception as e:
+                # Not a JPEG (e.g. a WMS error document); let OpenCV try
+                logger.debug(f"TurboJPEG decode failed: {e}")
+        
+        # imdecode also yields BGR, so no separate color conversion pass
+        image_array = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if image_array is not None:
+            return image_array
+
+        # Formats OpenCV cannot read still go through Pillow
+        image = Image.open(BytesIO(data))
+        image.load()
+        # Read-only view of Pillow's decoded buffer, no copy yet
+        image_array = np.asarray(image)
+        
+        # Flip RGB to BGR while taking the single writable copy OpenCV needs
+        if image_array.ndim == 3 and image_array.shape[2] == 3:
+            return np.ascontiguousarray(image_array[..., ::-1])
+        
+        return image_array.copy()
+
     def get_available_layers(self) -> List[str]:
         """Get list of available layers"""
         return [
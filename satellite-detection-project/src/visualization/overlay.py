@@ -1,10 +1,153 @@
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
+from dataclasses import dataclass
+import threading
 import numpy as np
 import cv2
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.colors import ListedColormap
 import base64
-import io
+
+# libjpeg-turbo encodes BGR directly; the wrapper also needs the shared
+# library at runtime, so a missing library disables it like a missing package
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+# Quality used when reports are encoded as JPEG
+REPORT_JPEG_QUALITY = 85
+
+# Longest side of one report panel; larger inputs are scaled down so the
+# 2x2 report stays around the size of the old 1200x1200 figure
+REPORT_PANEL_SIZE = 600
+
+# Numba compiles a parallel outline kernel for dense detection sets
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Box count from which the Numba kernel replaces cv2.polylines. The kernel
+# fills each outer corner square where polylines rounds the join, so dense
+# overlays gain a few corner pixels per box and are otherwise identical
+NUMBA_MIN_BOXES = 256
+
+if _HAS_NUMBA:
+    # Compiled on first use rather than cached on disk: cache entries are
+    # keyed to the importing module's name and fail to load under another
+    @njit(parallel=True)
+    def _draw_outlines(image, boxes, c0, c1, c2, thickness):
+        """
+        Write the outline of each (x1, y1, x2, y2) box straight into an (H, W, 3) image
+        
+        Bands match cv2.polylines at the same thickness except at the outer
+        corners, which are square here and rounded there.
+        """
+        height, width = image.shape[0], image.shape[1]
+        # Same band half-width as OpenCV's thick lines
+        half = (thickness + 1) // 2 if thickness > 1 else 0
+        for i in prange(boxes.shape[0]):
+            x1, x2 = min(boxes[i, 0], boxes[i, 2]), max(boxes[i, 0], boxes[i, 2])
+            y1, y2 = min(boxes[i, 1], boxes[i, 3]), max(boxes[i, 1], boxes[i, 3])
+            left, right = max(0, x1 - half), min(width - 1, x2 + half)
+            top, bottom = max(0, y1 - half), min(height - 1, y2 + half)
+            for y in range(top, bottom + 1):
+                if y <= y1 + half or y >= y2 - half:
+                    # Top or bottom edge: the whole span
+                    for x in range(left, right + 1):
+                        image[y, x, 0] = c0
+                        image[y, x, 1] = c1
+                        image[y, x, 2] = c2
+                    continue
+                # Between them only the left and right edges
+                for x in range(left, min(right, x1 + half) + 1):
+                    image[y, x, 0] = c0
+                    image[y, x, 1] = c1
+                    image[y, x, 2] = c2
+                for x in range(max(left, x2 - half), right + 1):
+                    image[y, x, 0] = c0
+                    image[y, x, 1] = c1
+                    image[y, x, 2] = c2
+
+# Detections per block when checking outlines against earlier label tags
+LABEL_OVERLAP_BLOCK = 512
+
+def _use_outline_kernel(image: np.ndarray, count: int) -> bool:
+    """Whether count outlines on image go through the Numba kernel instead of cv2.polylines"""
+    return (_HAS_NUMBA and count >= NUMBA_MIN_BOXES and image.dtype == np.uint8
+            and image.ndim == 3 and image.shape[2] == 3 and image.flags.c_contiguous)
+
+# Colormap names accepted by create_heatmap_overlay. OpenCV has no terrain
+# map, so "terrain" uses TURBO; names missing from older OpenCV builds are
+# left out and fall back to VIRIDIS like any unknown name.
+COLORMAPS = {
+    name: getattr(cv2, attr)
+    for name, attr in (
+        ("viridis", "COLORMAP_VIRIDIS"),
+        ("plasma", "COLORMAP_PLASMA"),
+        ("inferno", "COLORMAP_INFERNO"),
+        ("magma", "COLORMAP_MAGMA"),
+        ("cividis", "COLORMAP_CIVIDIS"),
+        ("hot", "COLORMAP_HOT"),
+        ("jet", "COLORMAP_JET"),
+        ("rainbow", "COLORMAP_RAINBOW"),
+        ("ocean", "COLORMAP_OCEAN"),
+        ("terrain", "COLORMAP_TURBO")
+    )
+    if hasattr(cv2, attr)
+}
+
+# Opt-in: when True, OpenCV's transparent API runs the per-pixel heatmap
+# work (resize, normalize, colormap, blend) through OpenCL on UMat inputs,
+# as long as the process has OpenCL enabled (cv2.ocl.setUseOpenCL, which
+# this module leaves to the application). Otherwise everything stays on
+# plain arrays.
+USE_OPENCL = False
+
+def _use_opencl() -> bool:
+    """Whether heatmap work goes through UMat and OpenCL"""
+    return USE_OPENCL and cv2.ocl.useOpenCL()
+
+def _device(array: np.ndarray):
+    """Wrap an array as a UMat when OpenCL is in use"""
+    return cv2.UMat(array) if _use_opencl() else array
+
+def _host(array) -> np.ndarray:
+    """Download a UMat result back into a NumPy array"""
+    return array.get() if isinstance(array, cv2.UMat) else array
+
+# Hershey digits share one advance width, so label texts that only differ
+# in their digits measure the same
+_DIGITS_TO_ZERO = str.maketrans('123456789', '000000000')
+
+@dataclass
+class Detections:
+    """
+    Detections as parallel arrays rather than a list of dicts
+    
+    Attributes:
+        boxes: (N, 4) x1, y1, x2, y2 pixel boxes
+        confidences: (N,) detection confidences
+        labels: Optional (N,) per-detection labels used instead of the overlay label
+    """
+    boxes: np.ndarray
+    confidences: np.ndarray
+    labels: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.confidences)
+
+def _to_soa(detections: Union[List[Dict], Detections]) -> Detections:
+    """Convert list-of-dict detections with "box" and "confidence" keys to Detections"""
+    if isinstance(detections, Detections):
+        return detections
+    return Detections(
+        boxes=np.asarray([detection["box"] for detection in detections], dtype=np.float64).reshape(-1, 4),
+        confidences=np.asarray([detection["confidence"] for detection in detections], dtype=np.float64)
+    )
 
 class DetectionOverlay:
     """Create visualization overlays for detection results"""
@@ -12,85 +155,303 @@ class DetectionOverlay:
         self.config = config
         self.color_map = config.VisualizationConfig.color_map
         self.overlay_alpha = config.VisualizationConfig.overlay_alpha
+        # 'jpeg' (smaller, faster) or 'png' when the report must be lossless
+        self.report_format = getattr(config.VisualizationConfig, 'report_format', 'jpeg')
+        self.report_panel_size = getattr(config.VisualizationConfig, 'report_panel_size', REPORT_PANEL_SIZE)
+        # Per-thread scratch buffers for intermediates, reused across calls
+        self._scratch_local = threading.local()
+
+    def _scratch(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """
+        Return a reusable uninitialized array for an intermediate result
+        
+        Each name keeps one flat buffer per thread that only grows, so
+        repeated calls at the same or smaller sizes allocate nothing. The
+        array is overwritten by the next call using the same name and must
+        never be returned to callers.
+        
+        Returns:
+            Contiguous array of the given shape
+        """
+        buffers = getattr(self._scratch_local, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch_local.buffers = {}
+        size = int(np.prod(shape))
+        buffer = buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            buffer = buffers[name] = np.empty(size, dtype=dtype)
+        return buffer[:size].reshape(shape)
 
     def create_detection_overlay(
         self,
         image: np.ndarray,
-        detections: List[Dict],
+        detections: Union[List[Dict], Detections],
         label: str,
         color: Tuple[int, int, int] = (255, 0, 0)
     ) -> np.ndarray:
         """Create overlay image with detection bounding boxes"""
         overlay = image.copy()
+        detections = _to_soa(detections)
+
+        # Blending an untouched copy with the original is a no-op
+        if not len(detections):
+            return overlay
+
+        # Line and text sizes scale with image width
+        height, width = image.shape[:2]
+        box_thickness = max(2, int(0.02 * width))
+        font_scale = max(0.5, 0.002 * width)
+        text_thickness = max(1, int(0.001 * width))
+
+        boxes = detections.boxes.astype(np.int32)
+
+        # Drawing coordinates clipped to just outside the image; an edge
+        # past the line width off-image was never visible, so the outlines
+        # come out the same while the ROI and line spans stay bounded
+        margin = box_thickness + 1
+        outlines = np.clip(boxes, -margin, np.int32([width, height, width, height]) + margin)
+
+        # "<label>: <confidence>" for every detection at once
+        labels = detections.labels if detections.labels is not None else label
+        texts = np.char.add(np.char.add(labels, ': '), np.char.mod('%.2f', detections.confidences))
+        tags = self._layout_labels(boxes, texts, font_scale, text_thickness)
+
+        # Only the union of the boxes (plus line width) and their labels
+        # changes, so draw and blend within that region alone
+        x0 = max(0, min(int(outlines[:, [0, 2]].min()) - box_thickness, min(tag[3] for tag in tags)))
+        y0 = max(0, min(int(outlines[:, [1, 3]].min()) - box_thickness, min(tag[4] for tag in tags)))
+        x1 = min(width, max(int(outlines[:, [0, 2]].max()) + box_thickness, max(tag[5] for tag in tags)) + 1)
+        y1 = min(height, max(int(outlines[:, [1, 3]].max()) + box_thickness, max(tag[6] for tag in tags)) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return overlay
+
+        roi = overlay[y0:y1, x0:x1]
+        roi_overlay = self._scratch('roi', roi.shape, roi.dtype)
+        np.copyto(roi_overlay, roi)
+
+        # Draw all bounding boxes in one call
+        outlines -= np.int32([x0, y0, x0, y0])
+        use_kernel = _use_outline_kernel(roi_overlay, len(outlines))
+        self._draw_bounding_boxes(roi_overlay, outlines, color, box_thickness, use_kernel=use_kernel)
+
+        # Add label and confidence; each label stays under the outlines of
+        # later detections, as when every box was drawn before its own label
+        self._add_labels(
+            roi_overlay, tags, color, font_scale, text_thickness, origin=(x0, y0),
+            outlines=outlines, box_thickness=box_thickness, use_kernel=use_kernel
+        )
 
-        for detection in detections:
-            box = detection["box"]
-            confidence = detection["confidence"]
-
-            # Draw bounding box
-            overlay = self._draw_bounding_box(overlay, box, color)
-
-            # Add label and confidence
-            overlay = self._add_label(overlay, box, label, confidence, color)
-
-        # Apply transparency
-        overlay = self._apply_transparency(overlay, image)
+        # Apply transparency in place over the region
+        self._apply_transparency(roi_overlay, roi, dst=roi)
 
         return overlay
 
-    def _draw_bounding_box(self, image: np.ndarray, box: List[float], color: Tuple[int, int, int]) -> np.ndarray:
-        """Draw bounding box on image"""
-        x1, y1, x2, y2 = map(int, box)
-        thickness = max(2, int(0.02 * image.shape[1]))  # Scale with image width
-
-        # Draw rectangle
-        cv2.rectangle(image, (x1, y1), (x2, y2), color, thickness)
+    def _draw_bounding_boxes(
+        self,
+        image: np.ndarray,
+        boxes: np.ndarray,
+        color: Tuple[int, int, int],
+        thickness: int,
+        use_kernel: Optional[bool] = None
+    ) -> np.ndarray:
+        """Draw (N, 4) int32 x1, y1, x2, y2 bounding boxes on image"""
+        if use_kernel is None:
+            use_kernel = _use_outline_kernel(image, len(boxes))
+        # Dense detection sets go through the compiled kernel, which draws
+        # square-cornered outlines rather than polylines' rounded joins
+        if use_kernel:
+            _draw_outlines(image, np.ascontiguousarray(boxes), *map(int, color[:3]), thickness)
+            return image
+
+        # Corner points of every box as one (N, 4, 2) polygon batch; same
+        # outline as cv2.rectangle, without a Python-to-C call per box
+        corners = boxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+        cv2.polylines(image, corners, True, color, thickness)
 
         return image
 
-    def _add_label(self, image: np.ndarray, box: List[float], label: str, confidence: float, color: Tuple[int, int, int]) -> np.ndarray:
-        """Add label and confidence text"""
-        x1, y1, x2, y2 = map(int, box)
-        font_scale = max(0.5, 0.002 * image.shape[1])  # Scale with image width
-        thickness = max(1, int(0.001 * image.shape[1]))
-
-        # Create label text
-        text = f"{label}: {confidence:.2f}"
-
-        # Get text size
-        (text_width, text_height), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
-
-        # Position text (top-left of box)
-        text_x = x1
-        text_y = y1 - 5
-
-        # Draw text background
-        cv2.rectangle(
-            image,
-            (text_x, text_y - text_height - 5),
-            (text_x + text_width, text_y + 5),
-            color,
-            -1
-        )
+    def _layout_labels(
+        self,
+        boxes: np.ndarray,
+        texts: np.ndarray,
+        font_scale: float,
+        thickness: int
+    ) -> List[Tuple]:
+        """
+        Measure and position the label tag of each box
+        
+        Returns:
+            (text, text_x, text_y, left, top, right, bottom) per box, in image coordinates
+        """
+        # Each distinct text shape (digits aside) is only measured once
+        text_sizes = {}
+
+        tags = []
+        for box, text in zip(boxes, texts.tolist()):
+            shape = text.translate(_DIGITS_TO_ZERO)
+            size = text_sizes.get(shape)
+            if size is None:
+                size = text_sizes[shape] = cv2.getTextSize(
+                    text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
+                )
+            (text_width, text_height), baseline = size
+
+            # Position text (top-left of box); the background reaches below
+            # the baseline so descenders stay on it
+            text_x = int(box[0])
+            text_y = int(box[1]) - 5
+            tags.append((
+                text, text_x, text_y,
+                text_x, text_y - text_height - 5,
+                text_x + text_width, text_y + max(5, baseline)
+            ))
+
+        return tags
+
+    def _add_labels(
+        self,
+        image: np.ndarray,
+        tags: List[Tuple],
+        color: Tuple[int, int, int],
+        font_scale: float,
+        thickness: int,
+        origin: Tuple[int, int] = (0, 0),
+        outlines: Optional[np.ndarray] = None,
+        box_thickness: int = 0,
+        use_kernel: bool = False
+    ) -> np.ndarray:
+        """
+        Add label tags from _layout_labels to image, whose top-left sits at origin
+        
+        Args:
+            outlines: Optional (N, 4) boxes already drawn on image, relative to
+                image rather than origin; tag i is kept under the outline of
+                every later box, as drawn by _draw_bounding_boxes with
+                box_thickness and use_kernel
+        """
+        # Render all tags off-screen over their union, clipped to the image
+        ox, oy = origin
+        height, width = image.shape[:2]
+        x0 = max(ox, min(tag[3] for tag in tags))
+        y0 = max(oy, min(tag[4] for tag in tags))
+        x1 = min(ox + width, max(tag[5] for tag in tags) + 1)
+        y1 = min(oy + height, max(tag[6] for tag in tags) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return image
+
+        # Tags are drawn in detection order, so each pixel's index map entry
+        # ends up as the last tag covering it (-1 where there is none)
+        layer = self._scratch('label_layer', (y1 - y0, x1 - x0, 3), image.dtype)
+        label_order = self._scratch('label_order', layer.shape[:2], np.int32)
+        layer.fill(0)
+        label_order.fill(-1)
+        for index, (text, text_x, text_y, left, top, right, bottom) in enumerate(tags):
+            # Draw text background
+            cv2.rectangle(layer, (left - x0, top - y0), (right - x0, bottom - y0), color, -1)
+            cv2.rectangle(label_order, (left - x0, top - y0), (right - x0, bottom - y0), index, -1)
+
+            # Draw text
+            cv2.putText(
+                layer,
+                text,
+                (text_x - x0, text_y - y0),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                font_scale,
+                (255, 255, 255),  # White text
+                thickness,
+                cv2.LINE_AA
+            )
 
-        # Draw text
-        cv2.putText(
-            image,
-            text,
-            (text_x, text_y),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            font_scale,
-            (255, 255, 255),  # White text
-            thickness,
-            cv2.LINE_AA
-        )
+        # A tag pixel shows unless the outline of a later box crosses it
+        outline_order = None
+        if outlines is not None:
+            rects = np.asarray([tag[3:] for tag in tags], dtype=np.int32) - np.int32([x0, y0, x0, y0])
+            outline_order = self._later_outline_order(
+                label_order, rects, outlines - np.int32([x0 - ox, y0 - oy] * 2), box_thickness, use_kernel
+            )
+        coverage = cv2.compare(label_order, 0 if outline_order is None else outline_order, cv2.CMP_GE)
+
+        # Composite the finished tags in one masked pass
+        cv2.copyTo(layer, coverage, image[y0 - oy:y1 - oy, x0 - ox:x1 - ox])
 
         return image
 
-    def _apply_transparency(self, overlay: np.ndarray, original: np.ndarray) -> np.ndarray:
+    def _later_outline_order(
+        self,
+        label_order: np.ndarray,
+        rects: np.ndarray,
+        outlines: np.ndarray,
+        thickness: int,
+        use_kernel: bool
+    ) -> Optional[np.ndarray]:
+        """
+        Index map of the outlines drawn over an earlier detection's tag
+        
+        Args:
+            label_order: Tag index map from _add_labels
+            rects: (N, 4) left, top, right, bottom tag rectangles
+            outlines: (N, 4) x1, y1, x2, y2 boxes, in label_order coordinates
+                like rects
+        
+        Returns:
+            int32 map shaped like label_order holding the last such outline
+            covering each pixel (0 elsewhere, as the first outline follows no
+            tag), or None when no outline reaches a tag that comes before it
+        """
+        # Conservative outline extents, tested blockwise against every
+        # earlier tag so the pairwise masks stay small
+        lower = np.minimum(outlines[:, :2], outlines[:, 2:]) - thickness
+        upper = np.maximum(outlines[:, :2], outlines[:, 2:]) + thickness
+        count = len(outlines)
+        later = []
+        for start in range(0, count, LABEL_OVERLAP_BLOCK):
+            stop = min(count, start + LABEL_OVERLAP_BLOCK)
+            hits = (
+                (lower[start:stop, None, 0] <= rects[None, :, 2])
+                & (upper[start:stop, None, 0] >= rects[None, :, 0])
+                & (lower[start:stop, None, 1] <= rects[None, :, 3])
+                & (upper[start:stop, None, 1] >= rects[None, :, 1])
+                & (np.arange(count)[None, :] < np.arange(start, stop)[:, None])
+            )
+            later.extend((start + np.flatnonzero(hits.any(axis=1))).tolist())
+        if not later:
+            return None
+
+        # Redraw just those outlines, in order and with the same geometry
+        # as the drawn ones, as their indices
+        outline_order = self._scratch('outline_order', label_order.shape, np.int32)
+        outline_order.fill(0)
+        height, width = outline_order.shape
+        half = (thickness + 1) // 2 if thickness > 1 else 0
+        for index in later:
+            box = outlines[index]
+            if not use_kernel:
+                corners = box[[0, 1, 2, 1, 2, 3, 0, 3]].reshape(1, 4, 2)
+                cv2.polylines(outline_order, corners, True, index, thickness)
+                continue
+            # The kernel's square bands, as four clipped slices
+            bx1, bx2 = sorted((int(box[0]), int(box[2])))
+            by1, by2 = sorted((int(box[1]), int(box[3])))
+            left, right = max(0, bx1 - half), min(width, bx2 + half + 1)
+            top, bottom = max(0, by1 - half), min(height, by2 + half + 1)
+            if left >= right or top >= bottom:
+                continue
+            outline_order[top:max(top, by1 + half + 1), left:right] = index
+            outline_order[max(top, by2 - half):bottom, left:right] = index
+            outline_order[top:bottom, left:max(left, bx1 + half + 1)] = index
+            outline_order[top:bottom, max(left, bx2 - half):right] = index
+
+        return outline_order
+
+    def _apply_transparency(
+        self,
+        overlay: np.ndarray,
+        original: np.ndarray,
+        dst: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Apply transparency to overlay"""
         alpha = self.overlay_alpha
-        return cv2.addWeighted(overlay, alpha, original, 1 - alpha, 0)
+        return cv2.addWeighted(overlay, alpha, original, 1 - alpha, 0, dst=dst)
 
     def create_heatmap_overlay(
         self,
@@ -99,32 +460,31 @@ class DetectionOverlay:
         colormap: str = "viridis"
     ) -> np.ndarray:
         """Create heatmap overlay for probability maps"""
-        # Normalize heatmap to [0, 255]
-        heatmap_normalized = cv2.normalize(heatmap, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+        # Host scratch buffers only; UMat pipelines keep their own device buffers
+        if _use_opencl():
+            normalized_dst = color_dst = None
+        else:
+            normalized_dst = self._scratch('heatmap_u8', heatmap.shape[:2], np.uint8)
+            color_dst = self._scratch('heatmap_color', heatmap.shape[:2] + (3,), np.uint8)
+
+        # Normalize heatmap to [0, 255], scaling and converting to uint8 in one pass
+        heatmap_normalized = cv2.normalize(
+            _device(heatmap), normalized_dst, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U
+        )
 
         # Apply colormap
-        heatmap_color = cv2.applyColorMap(heatmap_normalized, self._get_colormap_id(colormap))
+        heatmap_color = cv2.applyColorMap(
+            heatmap_normalized, self._get_colormap_id(colormap), dst=color_dst
+        )
 
-        # Blend with original image
-        overlay = cv2.addWeighted(heatmap_color, 0.5, image, 0.5, 0)
+        # Blend with original image into a fresh array for the caller
+        overlay = cv2.addWeighted(heatmap_color, 0.5, _device(image), 0.5, 0)
 
-        return overlay
+        return _host(overlay)
 
     def _get_colormap_id(self, colormap_name: str) -> int:
         """Get OpenCV colormap ID from name"""
-        colormap_mapping = {
-            "viridis": cv2.COLORMAP_VIRIDIS,
-            "plasma": cv2.COLORMAP_PLASMA,
-            "inferno": cv2.COLORMAP_INFERNO,
-            "magma": cv2.COLORMAP_MAGMA,
-            "cividis": cv2.COLORMAP_CIVIDIS,
-            "hot": cv2.COLORMAP_HOT,
-            "jet": cv2.COLORMAP_JET,
-            "rainbow": cv2.COLORMAP_RAINBOW,
-            "ocean": cv2.COLORMAP_OCEAN,
-            "terrain": cv2.COLORMAP_TERRRAIN
-        }
-        return colormap_mapping.get(colormap_name, cv2.COLORMAP_VIRIDIS)
+        return COLORMAPS.get(colormap_name, cv2.COLORMAP_VIRIDIS)
 
     def create_contour_overlay(
         self,
@@ -134,14 +494,21 @@ class DetectionOverlay:
         color: Tuple[int, int, int] = (0, 255, 0)
     ) -> np.ndarray:
         """Create contour overlay from probability map"""
-        # Binarize probability map
-        binary_map = (probability_map > threshold).astype(np.uint8) * 255
+        # Binarize probability map straight to a 0/255 mask
+        binary_map = cv2.compare(
+            probability_map, threshold, cv2.CMP_GT,
+            dst=self._scratch('binary_map', probability_map.shape[:2], np.uint8)
+        )
+
+        # Nothing above threshold means no contours to find or draw
+        overlay = image.copy()
+        if not cv2.countNonZero(binary_map):
+            return overlay
 
         # Find contours
         contours, _ = cv2.findContours(binary_map, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
         # Draw contours on image
-        overlay = image.copy()
         cv2.drawContours(overlay, contours, -1, color, 2)
 
         return overlay
@@ -150,58 +517,114 @@ class DetectionOverlay:
         self,
         original_image: np.ndarray,
         preprocessed_image: np.ndarray,
-        detections: List[Dict],
+        detections: Union[List[Dict], Detections],
         heatmap: Optional[np.ndarray] = None
     ) -> str:
-        """Generate a complete visualization report as base64 string"""
-        # Create figure
-        fig, axes = plt.subplots(2, 2, figsize=(12, 12))
-        fig.tight_layout(pad=3.0)
-
-        # Original image
-        axes[0, 0].imshow(cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB))
-        axes[0, 0].set_title('Original Image')
-        axes[0, 0].axis('off')
-
-        # Preprocessed image
-        axes[0, 1].imshow(cv2.cvtColor(preprocessed_image, cv2.COLOR_BGR2RGB))
-        axes[0, 1].set_title('Preprocessed Image')
-        axes[0, 1].axis('off')
+        """Generate a complete visualization report as a base64 JPEG or PNG string (see report_format)"""
+        # 2x2 mosaic of titled panels at the original image size, scaled
+        # down to fit within report_panel_size
+        height, width = original_image.shape[:2]
+        scale = min(1.0, self.report_panel_size / max(height, width))
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
 
         # Detection overlay
+        overlay_image = None
         if detections:
             overlay_image = self.create_detection_overlay(
-                original_image.copy(),
+                original_image,
                 detections,
                 label="Detection",
                 color=(255, 0, 0)
             )
-            axes[1, 0].imshow(cv2.cvtColor(overlay_image, cv2.COLOR_BGR2RGB))
-            axes[1, 0].set_title('Detection Overlay')
-            axes[1, 0].axis('off')
 
         # Heatmap
+        heatmap_overlay = None
         if heatmap is not None:
             heatmap_overlay = self.create_heatmap_overlay(
                 original_image,
                 heatmap,
                 colormap=self.color_map
             )
-            axes[1, 1].imshow(cv2.cvtColor(heatmap_overlay, cv2.COLOR_BGR2RGB))
-            axes[1, 1].set_title('Heatmap Overlay')
-            axes[1, 1].axis('off')
 
-        # Save to bytes
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        plt.close(fig)
-        buf.seek(0)
+        tiles = [
+            self._report_tile('Original Image', original_image, size),
+            self._report_tile('Preprocessed Image', preprocessed_image, size),
+            self._report_tile('Detection Overlay', overlay_image, size),
+            self._report_tile('Heatmap Overlay', heatmap_overlay, size)
+        ]
+        mosaic = cv2.vconcat([cv2.hconcat(tiles[:2]), cv2.hconcat(tiles[2:])])
 
         # Convert to base64
-        image_base64 = base64.b64encode(buf.read()).decode('utf-8')
+        image_base64 = base64.b64encode(self._encode_report(mosaic)).decode('utf-8')
 
         return image_base64
 
+    def _encode_report(self, mosaic: np.ndarray) -> bytes:
+        """Encode a BGR report image in the configured report_format"""
+        if self.report_format == 'png':
+            ok, buf = cv2.imencode('.png', mosaic, [cv2.IMWRITE_PNG_COMPRESSION, 3])
+        elif self.report_format == 'jpeg':
+            if _turbo_jpeg is not None:
+                return _turbo_jpeg.encode(mosaic, quality=REPORT_JPEG_QUALITY, pixel_format=TJPF_BGR)
+            ok, buf = cv2.imencode('.jpg', mosaic, [cv2.IMWRITE_JPEG_QUALITY, REPORT_JPEG_QUALITY])
+        else:
+            raise ValueError(f"Unsupported report format: {self.report_format}")
+
+        if not ok:
+            raise ValueError("Failed to encode visualization report")
+        return buf.tobytes()
+
+    def _report_tile(self, title: str, panel: Optional[np.ndarray], size: Tuple[int, int]) -> np.ndarray:
+        """Render one report panel as a BGR uint8 tile of the given (width, height) under a title bar"""
+        width, height = size
+
+        # Title bar
+        font_scale = max(0.5, 0.0015 * width)
+        thickness = max(1, int(0.002 * width))
+        (text_width, text_height), baseline = cv2.getTextSize(title, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+        padding = text_height // 2 + 2
+        bar_height = text_height + baseline + 2 * padding
+
+        # Bar and panel are written straight into one tile instead of being
+        # stacked with vconcat afterwards
+        tile = np.empty((bar_height + height, width, 3), dtype=np.uint8)
+        bar, body = tile[:bar_height], tile[bar_height:]
+        bar.fill(255)
+        cv2.putText(
+            bar,
+            title,
+            ((width - text_width) // 2, padding + text_height),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            font_scale,
+            (0, 0, 0),
+            thickness,
+            cv2.LINE_AA
+        )
+
+        if panel is None:
+            # Missing panels are left blank
+            body.fill(255)
+            return tile
+
+        if panel.dtype != np.uint8:
+            # Float images are taken to be in [0, 1], as Matplotlib would display them
+            panel = (np.clip(panel, 0, 1) * 255).astype(np.uint8)
+        if panel.ndim == 3 and panel.shape[2] == 4:
+            # Drop the alpha channel of BGRA panels
+            panel = panel[..., :3]
+        if panel.shape[:2] != (height, width):
+            # Colour panels resize straight into the tile; grayscale ones
+            # resize a single channel before being expanded
+            panel = cv2.resize(
+                panel, (width, height), dst=body if panel.ndim == 3 else None, interpolation=cv2.INTER_AREA
+            )
+        if panel is not body:
+            # Grayscale panels broadcast across the channels at the NumPy
+            # level rather than through a cvtColor pass
+            body[...] = panel[..., None] if panel.ndim == 2 else panel
+
+        return tile
+
 # Advanced visualization utilities
 def create_probability_heatmap(
     image: np.ndarray,
@@ -210,21 +633,22 @@ def create_probability_heatmap(
 ) -> np.ndarray:
     """Create probability heatmap visualization"""
     # Resize heatmap to image size
-    heatmap_resized = cv2.resize(probability_map, (image.shape[1], image.shape[0]))
+    heatmap_resized = cv2.resize(_device(probability_map), (image.shape[1], image.shape[0]))
+
+    # Scale to [0, 255] and convert to uint8 in one pass, without a float temporary
+    heatmap_u8 = cv2.multiply(heatmap_resized, 255.0, dtype=cv2.CV_8U)
 
     # Create overlay
-    heatmap_color = cv2.applyColorMap(
-        (heatmap_resized * 255).astype(np.uint8),
-        cv2.COLORMAP_JET
-    )
+    heatmap_color = cv2.applyColorMap(heatmap_u8, cv2.COLORMAP_JET)
 
     # Blend with original image
-    overlay = cv2.addWeighted(heatmap_color, 0.6, image, 0.4, 0)
+    overlay = _host(cv2.addWeighted(heatmap_color, 0.6, _device(image), 0.4, 0, dst=heatmap_color))
 
-    # Add threshold contour
-    binary_map = (heatmap_resized > threshold).astype(np.uint8) * 255
-    contours, _ = cv2.findContours(binary_map, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    cv2.drawContours(overlay, contours, -1, (0, 255, 0), 2)
+    # Add threshold contour; compare yields the 0/255 mask directly
+    binary_map = cv2.compare(heatmap_resized, threshold, cv2.CMP_GT)
+    if cv2.countNonZero(binary_map):
+        contours, _ = cv2.findContours(_host(binary_map), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        cv2.drawContours(overlay, contours, -1, (0, 255, 0), 2)
 
     return overlay
 
@@ -234,21 +658,41 @@ def create_time_series_plot(
     title: str = "Detection Count Over Time"
 ) -> str:
     """Create time series plot of detection counts"""
-    plt.figure(figsize=(10, 6))
-    plt.plot(timestamps, detection_counts, marker='o', linewidth=2, markersize=5)
-    plt.title(title)
-    plt.xlabel('Time')
-    plt.ylabel('Detection Count')
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
-
-    # Save to bytes
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    plt.close()
-    buf.seek(0)
+    with _time_series_lock:
+        fig, ax = _time_series_figure()
+        ax.cla()
 
-    # Convert to base64
-    image_base64 = base64.b64encode(buf.read()).decode('utf-8')
+        ax.plot(timestamps, detection_counts, marker='o', linewidth=2, markersize=5)
+        ax.set_title(title)
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Detection Count')
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, alpha=0.3)
 
-    return image_base64
\ No newline at end of file
+        # Render and read the Agg canvas directly instead of savefig
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        ok, buf = cv2.imencode('.png', cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR))
+
+    if not ok:
+        raise ValueError("Failed to encode time series plot")
+
+    # Convert to base64
+    image_base64 = base64.b64encode(buf).decode('utf-8')
+
+    return image_base64
+
+# Time series plots share one figure; creating a figure and Agg canvas per
+# call costs more than clearing and redrawing the axes
+_time_series_lock = threading.Lock()
+_time_series_fig = None
+
+def _time_series_figure():
+    """Return the shared time series figure and axes, creating them on first use"""
+    global _time_series_fig
+    if _time_series_fig is None:
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        fig.add_subplot()
+        _time_series_fig = fig
+    return _time_series_fig, _time_series_fig.axes[0]
@@ -0,0 +1,18 @@
+"""Shared pytest fixtures"""
+
+import os
+import sys
+
+import pytest
+
+# Tests import the application as the ``src`` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import AppConfig
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    """Point exports at a temporary directory"""
+    monkeypatch.setattr(AppConfig.export, "export_dir", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,47 @@
+"""Tests for the JSON alert report export"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.utils.data_export import ALERT_FIELDS, DataExporter
+
+
+@pytest.fixture
+def detections():
+    return [
+        {
+            "latitude": 10.0 + i,
+            "longitude": 20.0,
+            "confidence": np.float64(0.9),
+            "power_mw": np.float64(12.5),
+            "source": "VIIRS",
+            "timestamp": f"2024-06-01T00:0{i}:00",
+        }
+        for i in range(3)
+    ]
+
+
+def _details(path):
+    with open(path, encoding="utf-8") as report:
+        return json.load(report)["detection_details"]
+
+
+def test_alert_report_accepts_numpy_values(export_dir, detections):
+    rows = _details(DataExporter().export_alert_report(detections, ["ops@example.com"]))
+
+    assert [row["power_mw"] for row in rows] == [12.5] * 3
+    assert list(rows[0]) == ALERT_FIELDS
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_columnar_alert_details_match_rows(export_dir, detections, stream):
+    exporter = DataExporter()
+    rows = _details(exporter.export_alert_report(detections, [], filename="rows.json"))
+    columns = _details(exporter.export_alert_report(
+        detections, [], filename="columns.json", stream=stream, columnar=True
+    ))
+
+    assert list(columns) == ALERT_FIELDS
+    assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
@@ -0,0 +1,173 @@
+"""Tests for fire history inserts, deduplication and time windows"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.config import AppConfig
+
+CENTER = [10.0, 20.0]
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    """A tracker writing to a fresh database"""
+    monkeypatch.setattr(AppConfig.database, "db_path", str(tmp_path / "fire_history.db"))
+    from src.utils.fire_history import FireHistoryTracker
+
+    tracker = FireHistoryTracker()
+    yield tracker
+    tracker.close()
+
+
+@pytest.fixture
+def local_timezone(request):
+    """Run the test with the process local time zone set to request.param"""
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = request.param
+    time.tzset()
+    yield request.param
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+def firms(lat, acquired):
+    """A detection shaped like those detect_fires builds from FIRMS rows"""
+    return {
+        "latitude": lat,
+        "longitude": 20.0,
+        "confidence": 0.9,
+        "source": "NASA FIRMS",
+        "acquisition_date": acquired.strftime("%Y-%m-%d"),
+        "acquisition_time": acquired.strftime("%H%M"),
+    }
+
+
+def count_rows(tracker):
+    return tracker._get_conn().execute("SELECT COUNT(*) FROM fires").fetchone()[0]
+
+
+def test_batch_ids_are_consecutive(tracker):
+    ids = tracker.add_detections_batch(
+        [{"latitude": i, "longitude": 1.0, "confidence": 0.8} for i in range(5)], 10, CENTER
+    )
+
+    assert ids == list(range(ids[0], ids[0] + 5))
+    assert tracker.add_detection({"latitude": 9, "longitude": 9, "confidence": 0.8}, 10, CENTER) == ids[-1] + 1
+
+
+def test_detections_without_time_are_never_merged(tracker):
+    detection = {"latitude": 1.0, "longitude": 2.0, "confidence": 0.9, "source": "NASA FIRMS"}
+
+    first = tracker.add_detections_batch([detection, dict(detection)], 10, CENTER)
+    retry = tracker.add_detections_batch([detection], 10, CENTER)
+
+    assert len(set(first + retry)) == 3
+    assert count_rows(tracker) == 3
+
+
+def test_retried_firms_batch_returns_stored_ids(tracker):
+    acquired = datetime(2024, 6, 1, 1, 34)
+    batch = [firms(1.0, acquired), firms(2.0, acquired)]
+
+    ids = tracker.add_detections_batch(batch, 10, CENTER)
+
+    assert tracker.add_detections_batch(batch, 10, CENTER) == ids
+    assert count_rows(tracker) == 2
+
+
+def test_mixed_batch_maps_each_record_to_its_row(tracker):
+    acquired = datetime(2024, 6, 1, 13, 47)
+    untimed = {"latitude": 5.0, "longitude": 5.0, "confidence": 0.7, "source": "Demo"}
+    stored = tracker.add_detections_batch([firms(2.0, acquired)], 10, CENTER)[0]
+
+    ids = tracker.add_detections_batch(
+        [untimed, firms(2.0, acquired), dict(untimed), firms(3.0, acquired)], 10, CENTER
+    )
+
+    assert ids[1] == stored
+    assert len(set(ids)) == 4
+    rows = dict(tracker._get_conn().execute("SELECT id, latitude FROM fires").fetchall())
+    assert [rows[record_id] for record_id in ids] == [5.0, 2.0, 5.0, 3.0]
+
+
+def test_constraint_violations_still_raise(tracker):
+    detection = firms(1.0, datetime(2024, 6, 1, 1, 30))
+    detection["confidence"] = None
+
+    with pytest.raises(sqlite3.IntegrityError):
+        tracker.add_detections_batch([detection], 10, CENTER)
+    assert count_rows(tracker) == 0
+
+
+def test_detection_time_is_the_insert_time_for_firms_rows(tracker):
+    before = datetime.now()
+    record_id = tracker.add_detection(firms(1.0, datetime(2020, 1, 1, 0, 5)), 10, CENTER)
+
+    detection_time, acquisition_time = tracker._get_conn().execute(
+        "SELECT detection_time, acquisition_time FROM fires WHERE id = ?", (record_id,)
+    ).fetchone()
+    assert datetime.fromisoformat(detection_time) >= before
+    assert acquisition_time == "2020-01-01T00:05:00Z"
+
+
+def test_async_batch_insert(tracker):
+    ids = asyncio.run(tracker.add_detections_batch_async(
+        [{"latitude": 1.0, "longitude": 1.0, "confidence": 0.6}], 10, CENTER
+    ))
+
+    assert ids == [1]
+
+
+def test_migration_keeps_existing_rows(tmp_path, monkeypatch):
+    db_path = tmp_path / "fire_history.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE fires (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, detection_time TEXT NOT NULL,
+            latitude REAL NOT NULL, longitude REAL NOT NULL, confidence REAL NOT NULL,
+            power_mw REAL, distance_km REAL, source TEXT, search_radius_km REAL,
+            center_lat REAL, center_lon REAL, alert_sent BOOLEAN DEFAULT 0,
+            alert_time TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO fires (detection_time, latitude, longitude, confidence, source) VALUES
+            ('2024-01-01T00:00:00', 9, 9, 0.5, 'old'),
+            ('2024-01-01T00:00:00', 9, 9, 0.5, 'old');
+        CREATE INDEX idx_fires_dedup ON fires(detection_time, latitude, longitude, source);
+    """)
+    conn.close()
+    monkeypatch.setattr(AppConfig.database, "db_path", str(db_path))
+    from src.utils.fire_history import FireHistoryTracker
+
+    tracker = FireHistoryTracker()
+
+    assert count_rows(tracker) == 2
+    index_sql = tracker._get_conn().execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'idx_fires_dedup'"
+    ).fetchone()[0]
+    assert "acquisition_time" in index_sql
+    tracker.close()
+
+
+@pytest.mark.parametrize(
+    "local_timezone", ["UTC", "Asia/Tokyo", "America/Los_Angeles"], indirect=True
+)
+def test_recent_window_in_any_time_zone(tracker, local_timezone):
+    now = datetime.now()
+    utc_now = datetime.now(timezone.utc)
+    tracker.add_detections_batch([
+        {"latitude": 1.0, "longitude": 1.0, "confidence": 0.9, "timestamp": (now - timedelta(hours=20)).isoformat()},
+        {"latitude": 2.0, "longitude": 1.0, "confidence": 0.9, "timestamp": (now - timedelta(hours=30)).isoformat()},
+        firms(3.0, utc_now - timedelta(hours=20)),
+    ], 10, CENTER)
+
+    recent = tracker.get_recent_detections(hours=24, min_confidence=0.5)
+
+    assert sorted(d["latitude"] for d in recent) == [1.0, 3.0]
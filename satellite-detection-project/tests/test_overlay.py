@@ -0,0 +1,122 @@
+"""Tests for the detection overlay against per-detection drawing"""
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from src.visualization import overlay as overlay_module
+from src.visualization.overlay import DetectionOverlay
+
+ALPHA = 0.6
+COLOR = (0, 0, 255)
+
+
+@pytest.fixture
+def overlay():
+    config = SimpleNamespace(VisualizationConfig=SimpleNamespace(color_map="viridis", overlay_alpha=ALPHA))
+    return DetectionOverlay(config)
+
+
+def _reference(image, detections, label, draw_box):
+    """Draw each box then its label in turn, as the overlay originally did"""
+    result = image.copy()
+    width = image.shape[1]
+    box_thickness = max(2, int(0.02 * width))
+    font_scale = max(0.5, 0.002 * width)
+    thickness = max(1, int(0.001 * width))
+    for detection in detections:
+        x1, y1, x2, y2 = map(int, detection["box"])
+        draw_box(result, (x1, y1, x2, y2), box_thickness)
+
+        text = f"{label}: {detection['confidence']:.2f}"
+        (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+        text_x, text_y = x1, y1 - 5
+        cv2.rectangle(
+            result, (text_x, text_y - text_height - 5), (text_x + text_width, text_y + max(5, baseline)), COLOR, -1
+        )
+        cv2.putText(
+            result, text, (text_x, text_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), thickness, cv2.LINE_AA
+        )
+    return cv2.addWeighted(result, ALPHA, image, 1 - ALPHA, 0)
+
+
+def _rectangle(image, box, thickness):
+    cv2.rectangle(image, box[:2], box[2:], COLOR, thickness)
+
+
+def _random_detections(rng, count, width, height):
+    corners = rng.uniform(-50, [width + 50, height + 50], (count, 2))
+    sizes = rng.uniform(-20, 300, (count, 2))
+    return [
+        {"box": [*corner, *(corner + size)], "confidence": float(confidence)}
+        for corner, size, confidence in zip(corners, sizes, rng.uniform(0, 1, count))
+    ]
+
+
+def test_later_outline_stays_over_earlier_label(overlay):
+    image = np.full((480, 640, 3), 40, dtype=np.uint8)
+    detections = [
+        {"box": [100, 100, 300, 300], "confidence": 0.9},
+        {"box": [50, 80, 400, 400], "confidence": 0.8},
+    ]
+
+    result = overlay.create_detection_overlay(image, detections, "Fire", COLOR)
+
+    np.testing.assert_array_equal(result, _reference(image, detections, "Fire", _rectangle))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_overlay_matches_per_detection_drawing(overlay, seed):
+    rng = np.random.default_rng(seed)
+    height, width = (int(size) for size in rng.integers(64, 900, 2))
+    image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    detections = _random_detections(rng, int(rng.integers(1, 12)), width, height)
+
+    result = overlay.create_detection_overlay(image, detections, "Fire", COLOR)
+
+    np.testing.assert_array_equal(result, _reference(image, detections, "Fire", _rectangle))
+
+
+@pytest.mark.skipif(not overlay_module._HAS_NUMBA, reason="Numba is not installed")
+def test_dense_overlay_matches_per_detection_kernel_drawing(overlay):
+    rng = np.random.default_rng(7)
+    image = rng.integers(0, 255, (700, 900, 3), dtype=np.uint8)
+    detections = _random_detections(rng, overlay_module.NUMBA_MIN_BOXES + 44, 900, 700)
+
+    def kernel_box(result, box, thickness):
+        overlay_module._draw_outlines(result, np.int32([box]), *COLOR, thickness)
+
+    result = overlay.create_detection_overlay(image, detections, "Fire", COLOR)
+
+    np.testing.assert_array_equal(result, _reference(image, detections, "Fire", kernel_box))
+
+
+@pytest.mark.skipif(not overlay_module._HAS_NUMBA, reason="Numba is not installed")
+@pytest.mark.parametrize("thickness", [2, 3, 12])
+def test_kernel_outline_differs_from_polylines_only_at_corners(thickness):
+    box = np.int32([[60, 70, 220, 240]])
+    kernel = np.zeros((300, 300, 3), dtype=np.uint8)
+    polylines = kernel.copy()
+
+    overlay_module._draw_outlines(kernel, box, *COLOR, thickness)
+    cv2.polylines(polylines, box[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2), True, COLOR, thickness)
+
+    # Square corners cover the rounded ones and add nothing elsewhere
+    extra = (kernel != polylines).any(axis=-1)
+    assert not (polylines.any(axis=-1) & ~kernel.any(axis=-1)).any()
+    half = (thickness + 1) // 2
+    for x in (60, 220):
+        for y in (70, 240):
+            extra[y - half:y + half + 1, x - half:x + half + 1] = False
+    assert not extra.any()
+
+
+def test_heatmap_stays_on_host_unless_opencl_is_opted_in(overlay):
+    image = np.zeros((32, 48, 3), dtype=np.uint8)
+    heatmap = np.linspace(0, 1, 32 * 48, dtype=np.float32).reshape(32, 48)
+
+    assert not overlay_module.USE_OPENCL
+    assert overlay_module._device(heatmap) is heatmap
+    assert isinstance(overlay.create_heatmap_overlay(image, heatmap), np.ndarray)